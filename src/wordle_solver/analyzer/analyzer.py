@@ -1,12 +1,22 @@
 from typing import Any, Callable, Optional
 
 from wordle_solver.analyzer.candidate_guess.candidate_guesser import CandidateGuesser
+from wordle_solver.analyzer.guess_store import get_strategy
+from wordle_solver.analyzer.opening_book import ROOT, load_opening_book
+from wordle_solver.analyzer.scorer.remote_scorer_pool import RemoteScorerPool
 from wordle_solver.analyzer.scorer.scorer import Scorer
-from wordle_solver.analyzer.scorer.scorer_pool import ScorerPool
+from wordle_solver.analyzer.scorer.scorer_child import History
+from wordle_solver.analyzer.scorer.scorer_daemon import Address
+from wordle_solver.analyzer.scorer.scorer_pool import LocalScorerPool, ScorerPool
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus
 from wordle_solver.common.word_reducer import WordReducer
-from wordle_solver.common.guess_result import GuessResult, to_res_arr
+from wordle_solver.common.guess_result import GuessResult, from_pattern_id, to_pattern_id, to_res_arr
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
 from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
 from wordle_solver.util.constants import NUMBER_OF_GUESSES
+from wordle_solver.util.profiler import ProfileStats
 
 
 class Analyzer:
@@ -17,24 +27,80 @@ class Analyzer:
             starting_word: Optional[str],
             num_processes: int,
             max_search_depth: Optional[int] = None,
-            progress_bar=True):
-        
+            progress_bar=True,
+            exact_scoring: bool = False,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            use_opening_book: bool = True,
+            in_process: bool = False,
+            corpus: Optional[Corpus] = None,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False,
+            remote_workers: Optional[list[Address]] = None,
+            time_budget_s: Optional[float] = None):
+
         self._full_words = full_words
+        self._corpus = Corpus.from_words(full_words) if corpus is None else corpus
+        self._pattern_matrix = load_pattern_matrix(full_words)
         self._ss = SolveStatusNp()
-        self._word_reducer = WordReducer(full_words, self._ss)
+        self._candidate_ranking = candidate_ranking
+        self._num_ranked = num_ranked
+        self._word_reducer = WordReducer(full_words, self._ss, self._pattern_matrix, self._corpus, candidate_ranking, num_ranked)
 
         if max_search_depth is None:
             max_search_depth = NUMBER_OF_GUESSES
         max_search_depth = min(max_search_depth, NUMBER_OF_GUESSES)
         curr_guesses = 0 if starting_word is None else 1
 
-        self._scorer_pool = ScorerPool(
-            num_processes,
-            full_words,
-            curr_guesses,
-            NUMBER_OF_GUESSES,
-            max_search_depth,
-            progress_bar)
+        self._opening_book = None
+        if use_opening_book:
+            self._opening_book = load_opening_book(full_words, self._corpus, starting_word, max_search_depth, get_strategy(candidate_ranking, num_ranked, exact_scoring, starting_word))
+        self._book_node = None if self._opening_book is None else ROOT
+
+        if remote_workers:
+            self._scorer_pool = RemoteScorerPool(
+                remote_workers,
+                full_words,
+                curr_guesses,
+                NUMBER_OF_GUESSES,
+                max_search_depth,
+                progress_bar,
+                exact_scoring,
+                cache_budget_bytes,
+                pruning,
+                candidate_ranking,
+                num_ranked,
+                profile)
+        elif in_process:
+            self._scorer_pool = LocalScorerPool(
+                full_words,
+                curr_guesses,
+                NUMBER_OF_GUESSES,
+                max_search_depth,
+                progress_bar,
+                exact_scoring,
+                self._corpus,
+                cache_budget_bytes,
+                pruning,
+                candidate_ranking,
+                num_ranked,
+                profile)
+        else:
+            self._scorer_pool = ScorerPool(
+                num_processes,
+                full_words,
+                curr_guesses,
+                NUMBER_OF_GUESSES,
+                max_search_depth,
+                progress_bar,
+                exact_scoring,
+                self._corpus,
+                cache_budget_bytes,
+                pruning,
+                candidate_ranking,
+                num_ranked,
+                profile)
         
         # candidate_guesser = candidate_guesser_builder(self._trie)
         candidate_guesser = None
@@ -47,31 +113,102 @@ class Analyzer:
             max_search_depth,
             NUMBER_OF_GUESSES,
             curr_guesses,
-            progress_bar=progress_bar)
+            progress_bar=progress_bar,
+            time_budget_s=time_budget_s)
         self._word = starting_word
         self._starting_word = starting_word
+        self._last_search: tuple[Optional[int], bool] = (None, True)
 
     def update(self, results: GuessResult, word=None):
         if word is None:
             word = self._word
+        if self._word is None:
+            # the guess did not come from get_best_guess, so the scorer has not counted it yet
+            self._scorer.record_guess()
+        self._advance_book(word, results)
+
         res_arr = to_res_arr(word, results)
         word_arr = self._word_reducer.get_guess_arr(word)
         self._ss.update(word_arr, res_arr)
         self._word_reducer.update()
         self._scorer_pool.update(word, results)
         self._word = None
+        self._last_search = (None, True)
 
     def get_best_guess(self) -> str:
         if self._word is None:
-            self._word = self._scorer.get_best_word()
+            if self._book_node is not None:
+                self._scorer.record_guess()
+                self._word = self._full_words[self._opening_book.get_guess(self._book_node)]
+                self._last_search = (None, True)
+            else:
+                self._word = self._scorer.get_best_word()
+                self._last_search = (self._scorer.last_search_depth, self._scorer.last_search_complete)
         return self._word
+
+    def last_search(self) -> tuple[Optional[int], bool]:
+        # depth the search behind the current guess reached and whether that was its full depth, no depth when none ran
+        return self._last_search
     
+    def get_best_guesses(self, histories: list[History]) -> list[str]:
+        # best guesses for many games at once, each history is the (guess, pattern id) pairs played so far
+        # the current game is left as it was
+        unique = list(dict.fromkeys(tuple(history) for history in histories))
+        guesses: dict[History, str] = {}
+        states = []
+        for history in unique:
+            if (word := self._get_known_guess(history)) is not None:
+                guesses[history] = word
+                continue
+
+            ss = SolveStatusNp()
+            word_reducer = WordReducer(self._full_words, ss, self._pattern_matrix, self._corpus, self._candidate_ranking, self._num_ranked)
+            for word, pattern_id in history:
+                ss.update(word_reducer.get_guess_arr(word), to_res_arr(word, from_pattern_id(pattern_id)))
+                word_reducer.update()
+            states.append((history, word_reducer))
+
+        for (history, _), word in zip(states, self._scorer.get_best_words(states)):
+            guesses[history] = word
+        return [guesses[tuple(history)] for history in histories]
+
+    def _get_known_guess(self, history: History) -> Optional[str]:
+        # the starting word or the opening book move, when either covers history
+        if not history and self._starting_word is not None:
+            return self._starting_word
+        if self._opening_book is None:
+            return None
+
+        node = ROOT
+        for word, pattern_id in history:
+            if word != self._full_words[self._opening_book.get_guess(node)]:
+                return None
+            if (node := self._opening_book.get_child(node, pattern_id)) is None:
+                return None
+        return self._full_words[self._opening_book.get_guess(node)]
+
     def reset(self):
         self._ss = SolveStatusNp()
-        self._word_reducer = WordReducer(self._full_words, self._ss)
+        self._word_reducer = WordReducer(self._full_words, self._ss, self._pattern_matrix, self._corpus, self._candidate_ranking, self._num_ranked)
 
         self._scorer_pool.reset()
         self._scorer.reset(self._word_reducer, self._ss)
 
         self._word = self._starting_word
-    
\ No newline at end of file
+        self._book_node = None if self._opening_book is None else ROOT
+        self._last_search = (None, True)
+
+    def _advance_book(self, word: str, results: GuessResult):
+        if self._book_node is None:
+            return
+
+        if word != self._full_words[self._opening_book.get_guess(self._book_node)]:
+            self._book_node = None
+        else:
+            self._book_node = self._opening_book.get_child(self._book_node, to_pattern_id(results))
+
+    def profile_stats(self) -> ProfileStats:
+        return self._scorer_pool.profile_stats()
+
+    def close(self):
+        self._scorer_pool.close()
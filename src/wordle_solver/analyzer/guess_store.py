@@ -0,0 +1,76 @@
+import sqlite3
+from typing import Optional
+
+from wordle_solver.analyzer.scorer.scorer_child import History
+from wordle_solver.common.candidate_ranking import CandidateRanking
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.util.constants import GUESS_STORE_PATH
+from wordle_solver.util.utils import get_words_digest
+
+# seconds a connection waits on another process holding the write lock
+LOCK_TIMEOUT_SECONDS = 30.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS guesses (
+    words_digest BLOB NOT NULL,
+    prior_digest BLOB NOT NULL,
+    max_search_depth INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    history TEXT NOT NULL,
+    guess TEXT NOT NULL,
+    PRIMARY KEY (words_digest, prior_digest, max_search_depth, strategy, history)
+) WITHOUT ROWID
+'''
+
+
+def get_strategy(candidate_ranking: CandidateRanking, num_ranked: int, exact_scoring: bool, starting_word: Optional[str]) -> str:
+    # everything besides the word list, prior and depth that can change which guess a search picks
+    return f'{candidate_ranking.name}/{num_ranked}/{"exact" if exact_scoring else "float"}/{starting_word or "-"}'
+
+
+def encode_history(history: History) -> str:
+    return ','.join(f'{word}:{pattern_id}' for word, pattern_id in history)
+
+
+def decode_history(encoded: str) -> History:
+    if not encoded:
+        return ()
+    return tuple((word, int(pattern_id)) for word, pattern_id in (move.split(':') for move in encoded.split(',')))
+
+
+class GuessStore:
+    # best guesses of earlier runs, only shared between runs over the same words, prior, depth and strategy
+    def __init__(self, words: list[str], corpus: Corpus, max_search_depth: int, strategy: str, path: str = GUESS_STORE_PATH):
+        self._namespace = (get_words_digest(words), corpus.get_prior_digest(), max_search_depth, strategy)
+        self._conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT_SECONDS)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+
+    def get(self, history: History) -> Optional[str]:
+        row = self._conn.execute(
+            'SELECT guess FROM guesses WHERE words_digest = ? AND prior_digest = ? AND max_search_depth = ? AND strategy = ? AND history = ?',
+            (*self._namespace, encode_history(history))).fetchone()
+        return None if row is None else row[0]
+
+    def load(self) -> dict[History, str]:
+        rows = self._conn.execute(
+            'SELECT history, guess FROM guesses WHERE words_digest = ? AND prior_digest = ? AND max_search_depth = ? AND strategy = ?',
+            self._namespace)
+        return {decode_history(history): guess for history, guess in rows}
+
+    def put(self, history: History, guess: str):
+        self.put_many({history: guess})
+
+    def put_many(self, guesses: dict[History, str]):
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO guesses VALUES (?, ?, ?, ?, ?, ?)',
+                ((*self._namespace, encode_history(history), guess) for history, guess in guesses.items()))
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            'SELECT COUNT(*) FROM guesses WHERE words_digest = ? AND prior_digest = ? AND max_search_depth = ? AND strategy = ?',
+            self._namespace).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
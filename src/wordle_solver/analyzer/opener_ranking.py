@@ -0,0 +1,129 @@
+import hashlib
+import os
+import time
+from typing import Optional
+from tqdm import tqdm
+import numpy as np
+
+from wordle_solver.analyzer.scorer.scorer_backend import ScorerBackend
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.util.utils import get_words_digest
+
+CHECKPOINT_VERSION = 1
+# openers scored between checkpoint writes, a killed run loses at most this many
+CHECKPOINT_BATCH = 256
+
+
+def get_setup_digest(words: list[str], corpus: Corpus, max_search_depth: int, strategy: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(get_words_digest(words))
+    digest.update(corpus.get_prior_digest())
+    digest.update(f'{CHECKPOINT_VERSION}/{max_search_depth}/{strategy}'.encode())
+    return digest.hexdigest()
+
+
+class OpenerCheckpoint:
+    # append only file of "word ev" lines under a header naming the setup they were scored with
+    def __init__(self, path: str, setup_digest: str):
+        self._path = path
+        self._header = f'# {setup_digest}'
+
+    def load(self, words: list[str]) -> dict[str, float]:
+        if not os.path.isfile(self._path):
+            return {}
+
+        with open(self._path, 'r') as f:
+            lines = f.read().split('\n')
+        if lines[0] != self._header:
+            print(f'{self._path} was written for a different word list, prior, search depth or strategy, starting over...')
+            return {}
+
+        ret = {}
+        known = set(words)
+        # the last line can be cut short when a run is killed mid write
+        for line in lines[1:]:
+            split = line.split(' ')
+            if len(split) == 2 and split[0] in known:
+                try:
+                    ret[split[0]] = float(split[1])
+                except ValueError:
+                    pass
+
+        # appending after a cut short line would glue the next record onto it
+        if lines[-1] != '' or len(ret) != len(lines) - 2:
+            self._rewrite(ret)
+        return ret
+
+    def start(self):
+        with open(self._path, 'w') as f:
+            f.write(f'{self._header}\n')
+
+    def append(self, evs: dict[str, float]):
+        with open(self._path, 'a') as f:
+            f.writelines(f'{word} {ev!r}\n' for word, ev in evs.items())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite(self, evs: dict[str, float]):
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f'{self._header}\n')
+            f.writelines(f'{word} {ev!r}\n' for word, ev in evs.items())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+
+
+def rank_openers(
+        pool: ScorerBackend,
+        words: list[str],
+        corpus: Corpus,
+        checkpoint: OpenerCheckpoint,
+        time_budget_s: Optional[float] = None,
+        progress_bar: bool = True) -> dict[str, float]:
+    # expected guesses of every word as the first guess, resumed from and saved to checkpoint
+    # stops early once time_budget_s has passed, the scores so far are returned either way
+    deadline = None if time_budget_s is None else time.monotonic() + time_budget_s
+    evs = checkpoint.load(words)
+    if not evs:
+        checkpoint.start()
+    if len(evs) == len(words):
+        return evs
+
+    # likely winners go first so a run cut short by its budget has still scored the contenders
+    reducer = WordReducer(words, SolveStatusNp(), load_pattern_matrix(words), corpus)
+    order = np.argsort(reducer.get_guess_remaining_masses(), kind='stable')
+    todo = [int(i) for i in order if words[i] not in evs]
+
+    progress = tqdm(total=len(words), initial=len(words) - len(todo)) if progress_bar else None
+    for start in range(0, len(todo), CHECKPOINT_BATCH):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        batch = todo[start:start + CHECKPOINT_BATCH]
+        scored = {words[i]: float(ev) for i, ev in zip(batch, pool.process(batch, len(batch)))}
+        checkpoint.append(scored)
+        evs.update(scored)
+        if progress is not None:
+            progress.update(len(batch))
+
+    if progress is not None:
+        progress.close()
+    return evs
+
+
+def get_ranking(words: list[str], evs: dict[str, float]) -> list[tuple[str, float]]:
+    # best first, ties go to the earlier word in the list
+    order = {word: i for i, word in enumerate(words)}
+    return sorted(evs.items(), key=lambda item: (item[1], order[item[0]]))
+
+
+def write_ranking(ranking: list[tuple[str, float]], path: str):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        for rank, (word, ev) in enumerate(ranking, 1):
+            f.write(f'{rank} {word} {ev:.6f}\n')
+    os.replace(tmp_path, path)
@@ -0,0 +1,170 @@
+import os
+from typing import Optional, Self
+import numpy as np
+from tqdm import tqdm
+
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import from_pattern_id, get_pattern_ids
+from wordle_solver.common.word_reducer_constants import SOLVED_PATTERN
+from wordle_solver.util.constants import OPENING_BOOK_PATH
+from wordle_solver.util.utils import get_words_digest
+
+BOOK_VERSION = 2
+ROOT = 0
+NO_PARENT = -1
+
+type History = list[tuple[str, int]]
+
+
+class OpeningBook:
+    # best guesses for every state reachable within the first `depth` guesses, stored as a tree of nodes
+    # where a node's children are keyed by the pattern its guess got back
+    def __init__(
+            self,
+            guesses: np.ndarray,
+            parents: np.ndarray,
+            patterns: np.ndarray,
+            depth: int,
+            max_search_depth: int,
+            starting_word: Optional[str],
+            strategy: str,
+            words_digest: bytes,
+            prior_digest: bytes):
+        self._guesses = guesses
+        self._parents = parents
+        self._patterns = patterns
+        self._children = {(int(parent), int(pattern)): node for node, (parent, pattern) in enumerate(zip(parents, patterns)) if parent != NO_PARENT}
+
+        self.depth = depth
+        self.max_search_depth = max_search_depth
+        self.starting_word = starting_word
+        self.strategy = strategy
+        self.words_digest = words_digest
+        self.prior_digest = prior_digest
+
+    def __len__(self) -> int:
+        return len(self._guesses)
+
+    def get_guess(self, node: int) -> int:
+        return int(self._guesses[node])
+
+    def get_child(self, node: int, pattern_id: int) -> Optional[int]:
+        return self._children.get((node, pattern_id))
+
+    def save(self, path: str = OPENING_BOOK_PATH):
+        tmp_path = f'{path}.tmp.npz'
+        np.savez(
+            tmp_path,
+            guesses=self._guesses,
+            parents=self._parents,
+            patterns=self._patterns,
+            meta=np.array([BOOK_VERSION, self.depth, self.max_search_depth]),
+            starting_word=np.array('' if self.starting_word is None else self.starting_word),
+            strategy=np.array(self.strategy),
+            words_digest=np.frombuffer(self.words_digest, dtype=np.uint8),
+            prior_digest=np.frombuffer(self.prior_digest, dtype=np.uint8))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = OPENING_BOOK_PATH) -> Optional[Self]:
+        if not os.path.isfile(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            version, depth, max_search_depth = (int(v) for v in data['meta'])
+            if version != BOOK_VERSION:
+                return None
+
+            starting_word = str(data['starting_word']) or None
+            return cls(
+                data['guesses'],
+                data['parents'],
+                data['patterns'],
+                depth,
+                max_search_depth,
+                starting_word,
+                str(data['strategy']),
+                data['words_digest'].tobytes(),
+                data['prior_digest'].tobytes())
+
+    def matches(self, words: list[str], corpus: Corpus, starting_word: Optional[str], max_search_depth: int, strategy: str) -> bool:
+        return (
+            self.words_digest == get_words_digest(words)
+            and self.prior_digest == corpus.get_prior_digest()
+            and self.starting_word == starting_word
+            and self.max_search_depth == max_search_depth
+            and self.strategy == strategy)
+
+
+def load_opening_book(
+        words: list[str],
+        corpus: Corpus,
+        starting_word: Optional[str],
+        max_search_depth: int,
+        strategy: str,
+        path: str = OPENING_BOOK_PATH) -> Optional[OpeningBook]:
+    book = OpeningBook.load(path)
+    if book is None:
+        return None
+
+    if not book.matches(words, corpus, starting_word, max_search_depth, strategy):
+        print(f'{path} was built for a different word list, prior, starting word, search depth or strategy, ignoring it...')
+        return None
+
+    return book
+
+
+def build_opening_book(analyzer, words: list[str], corpus: Corpus, starting_word: Optional[str], max_search_depth: int, strategy: str, depth: int, progress_bar: bool = True) -> OpeningBook:
+    guesses = []
+    parents = []
+    patterns = []
+    
+    def add_node(parent: int, pattern_id: int, guess_i: int) -> int:
+        guesses.append(guess_i)
+        parents.append(parent)
+        patterns.append(pattern_id)
+        return len(guesses) - 1
+
+    word_idxs = {word: i for i, word in enumerate(words)}
+    root = add_node(NO_PARENT, 0, word_idxs[_search(analyzer, [])])
+    frontier: list[tuple[int, History, np.ndarray]] = [(root, [], np.arange(len(words)))]
+
+    for _ in range(depth - 1):
+        next_frontier = []
+        for node, history, survivors in (tqdm(frontier) if progress_bar else frontier):
+            guess_i = guesses[node]
+            ids = get_pattern_ids(corpus.words_arr[guess_i], corpus.words_arr[survivors])[0]
+
+            for pattern_id in np.unique(ids):
+                if pattern_id == SOLVED_PATTERN:
+                    continue
+                child_survivors = survivors[ids == pattern_id]
+                child_history = history + [(words[guess_i], int(pattern_id))]
+
+                if len(child_survivors) == 1:
+                    child_guess = int(child_survivors[0])
+                else:
+                    child_guess = word_idxs[_search(analyzer, child_history)]
+
+                child = add_node(node, int(pattern_id), child_guess)
+                next_frontier.append((child, child_history, child_survivors))
+        frontier = next_frontier
+
+    return OpeningBook(
+        np.array(guesses, dtype=np.int32),
+        np.array(parents, dtype=np.int32),
+        np.array(patterns, dtype=np.uint8),
+        depth,
+        max_search_depth,
+        starting_word,
+        strategy,
+        get_words_digest(words),
+        corpus.get_prior_digest())
+
+
+def _search(analyzer, history: History) -> str:
+    analyzer.reset()
+    for word, pattern_id in history:
+        analyzer.update(from_pattern_id(pattern_id), word)
+
+    return analyzer.get_best_guess()
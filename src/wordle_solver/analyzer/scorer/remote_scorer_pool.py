@@ -0,0 +1,87 @@
+from multiprocessing.connection import Client, Connection
+import time
+from typing import Optional
+
+from wordle_solver.analyzer.scorer.scorer_child import PREPARE, SET_LIMITS, SET_STATE, STOP
+from wordle_solver.analyzer.scorer.scorer_daemon import HEARTBEAT_INTERVAL_SECONDS, INIT, Address, get_authkey
+from wordle_solver.analyzer.scorer.scorer_backend import WorkerLostError
+from wordle_solver.analyzer.scorer.scorer_pool import CONNECTION_ERRORS, ConnectionScorerPool, _recv
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+
+# a busy worker that misses this many beats in a row is treated as lost
+MISSED_HEARTBEATS = 10
+RECONNECT_ATTEMPTS = 3
+RECONNECT_DELAY_SECONDS = 0.5
+
+
+class RemoteScorerPool(ConnectionScorerPool):
+    # one persistent connection per scorer daemon, lost workers are reconnected and replayed or dropped
+    def __init__(
+            self,
+            addresses: list[Address],
+            words: list[str],
+            starting_guesses: int,
+            max_guesses: int,
+            max_depth: int,
+            progress_bar: bool,
+            exact: bool = False,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False,
+            authkey: Optional[bytes] = None):
+        super().__init__(progress_bar, profile, MISSED_HEARTBEATS * HEARTBEAT_INTERVAL_SECONDS)
+        self._authkey = get_authkey() if authkey is None else authkey
+        self._init_args = (words, starting_guesses, max_guesses, max_depth, exact, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile)
+        self._addresses = list(addresses)
+        self._conns = [self._connect(address) for address in self._addresses]
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send((STOP, ()))
+            except CONNECTION_ERRORS:
+                pass
+            conn.close()
+        self._conns = []
+        self._addresses = []
+
+    def _connect(self, address: Address) -> Connection:
+        conn = Client(address, authkey=self._authkey)
+        try:
+            conn.send((INIT, self._init_args))
+            _recv(conn)
+            if self._candidate_words is not None:
+                conn.send((PREPARE, (self._candidate_words,)))
+                _recv(conn)
+            if self._history:
+                conn.send((SET_STATE, (self._history,)))
+                _recv(conn)
+            if self._search_limits is not None:
+                # a replacement only gets what is left of the budget
+                max_depth, deadline = self._search_limits
+                conn.send((SET_LIMITS, (max_depth, None if deadline is None else max(0.0, deadline - time.monotonic()))))
+                _recv(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _replace_lost(self, conn: Connection, reconnect: bool = True) -> Optional[Connection]:
+        pos = self._conns.index(conn)
+        conn.close()
+
+        for attempt in range(RECONNECT_ATTEMPTS if reconnect else 0):
+            try:
+                self._conns[pos] = self._connect(self._addresses[pos])
+                return self._conns[pos]
+            except CONNECTION_ERRORS:
+                time.sleep(RECONNECT_DELAY_SECONDS * 2 ** attempt)
+
+        del self._conns[pos]
+        del self._addresses[pos]
+        if not self._conns:
+            raise WorkerLostError('every remote scorer worker is lost')
+        return None
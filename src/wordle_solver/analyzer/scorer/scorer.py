@@ -1,11 +1,12 @@
 from collections import Counter, defaultdict, deque
 from decimal import Decimal
 from tqdm import tqdm
+import time
 from typing import Any, Iterable, Optional
 import numpy as np
 
-from wordle_solver.analyzer.scorer.scorer_child import get_base_word_and_distr
-from wordle_solver.analyzer.scorer.scorer_pool import ScorerPool
+from wordle_solver.analyzer.scorer.scorer_child import History, get_base_word_and_distr
+from wordle_solver.analyzer.scorer.scorer_backend import ScorerBackend
 from wordle_solver.analyzer.candidate_guess.candidate_guesser import CandidateGuesser
 from wordle_solver.common.word_reducer import WordReducer
 from wordle_solver.common.single_result import SingleResult
@@ -17,7 +18,7 @@ GUESS_THRESHOLD = Decimal('0.8')
 class Scorer:
     def __init__(
             self,
-            scorer_pool: ScorerPool,
+            scorer_pool: ScorerBackend,
             word_reducer: WordReducer,
             solve_status: SolveStatusNp,
             candidate_guesser: CandidateGuesser,
@@ -25,7 +26,8 @@ class Scorer:
             max_search_depth: int,
             max_guesses: int,
             curr_guesses: int = 0,
-            progress_bar: bool = True):
+            progress_bar: bool = True,
+            time_budget_s: Optional[float] = None):
         self._base_guesses = curr_guesses
 
         self._scorer_pool = scorer_pool
@@ -37,6 +39,10 @@ class Scorer:
         self._max_guesses = max_guesses
         self._curr_guesses = curr_guesses
         self._progress_bar = progress_bar
+        self._time_budget_s = time_budget_s
+        # depth the last get_best_word searched to and whether that was its full depth
+        self.last_search_depth: Optional[int] = None
+        self.last_search_complete = True
 
     def get_best_word(self) -> str:
         if self._progress_bar:
@@ -45,7 +51,8 @@ class Scorer:
         remaining_guesses = self._max_guesses - self._curr_guesses
         depth = min(remaining_guesses - 1, self._max_search_depth)
 
-
+        self.last_search_depth = None
+        self.last_search_complete = True
         if (res := get_base_word_and_distr(self._word_reducer, self._max_guesses, self._max_search_depth, self._curr_guesses, 0)) is not None:
             self._curr_guesses += 1
             return res[0]
@@ -53,10 +60,70 @@ class Scorer:
         self._curr_guesses += 1
 
         itr = self._word_reducer.get_top_candidates()
-        best_idx = np.argmin(self._scorer_pool.process(itr, len(itr)))
+        # likely winners go first so the pool holds a tight bound early, ties still go to the earlier candidate
+        order = np.argsort(self._word_reducer.get_guess_remaining_masses(np.array(itr)), kind='stable').tolist()
+        if self._time_budget_s is not None:
+            return self._full_words[itr[self._get_best_pos_anytime(itr, order, depth)]]
+
+        evs = self._scorer_pool.process([itr[pos] for pos in order], len(itr), bounded=True)
+        best_pos = min(range(len(order)), key=lambda k: (evs[k], order[k]))
+        self.last_search_depth = depth
+
+        return self._full_words[itr[order[best_pos]]]
+
+    def _get_best_pos_anytime(self, itr: list[int], order: list[int], max_depth: int) -> int:
+        # iterative deepening, the deepest round that finished within the budget picks the guess
+        # the depth one round always finishes so there is a guess to fall back on
+        deadline = time.monotonic() + self._time_budget_s
+        best_pos = None
+        try:
+            for depth in range(1, max_depth + 1):
+                remaining = deadline - time.monotonic()
+                if best_pos is not None and remaining <= 0:
+                    break
+
+                self._scorer_pool.set_search_limits(depth, None if best_pos is None else remaining)
+                evs = self._scorer_pool.process([itr[pos] for pos in order], len(order), bounded=True)
+                # workers that ran out of time scored their guesses as pruned, so the whole round is thrown away
+                if best_pos is not None and time.monotonic() >= deadline:
+                    break
+
+                best_pos = order[min(range(len(order)), key=lambda k: (evs[k], order[k]))]
+                self.last_search_depth = depth
+                # the next round starts on this round's best guesses so its bound tightens early
+                order = [order[k] for k in sorted(range(len(order)), key=lambda k: evs[k])]
+        finally:
+            self._scorer_pool.set_search_limits(None, None)
 
-        return self._full_words[itr[best_idx]]
+        self.last_search_complete = self.last_search_depth == max_depth
+        return best_pos
     
+    def get_best_words(self, states: list[tuple[History, WordReducer]]) -> list[str]:
+        # every (state, candidate) pair goes to the pool in one submission, the guesses made so far are the history length
+        ret: list[Optional[str]] = [None] * len(states)
+        items = []
+        owners = []
+        for pos, (history, word_reducer) in enumerate(states):
+            if (res := get_base_word_and_distr(word_reducer, self._max_guesses, self._max_search_depth, len(history), 0)) is not None:
+                ret[pos] = res[0]
+                continue
+
+            for i in word_reducer.get_top_candidates():
+                items.append((history, i))
+                owners.append(pos)
+
+        best: dict[int, tuple[float | Decimal, int]] = {}
+        for pos, (_, i), ev in zip(owners, items, self._scorer_pool.process_states(items)):
+            if pos not in best or ev < best[pos][0]:
+                best[pos] = (ev, i)
+
+        for pos, (_, i) in best.items():
+            ret[pos] = self._full_words[i]
+        return ret
+
+    def record_guess(self):
+        self._curr_guesses += 1
+
     def reset(self, word_reducer: WordReducer, solve_status: SolveStatusNp):
         self._word_reducer = word_reducer
         self._ss = solve_status
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from wordle_solver.analyzer.scorer.scorer_child import History
+from wordle_solver.common.guess_result import GuessResult
+from wordle_solver.util.profiler import ProfileStats
+
+
+class WorkerLostError(Exception):
+    pass
+
+
+class ScorerBackend(ABC):
+    # where candidate evaluations run, every backend keeps its workers on the state of the current game
+    @abstractmethod
+    def process(self, indexes: Iterable[int], num_items: int, bounded: bool = False) -> Iterable[float | Decimal]:
+        pass
+
+    @abstractmethod
+    def process_states(self, items: list[tuple[History, int]]) -> list[float | Decimal]:
+        pass
+
+    @abstractmethod
+    def prepare(self, indexes: Optional[list[int]]):
+        pass
+
+    @abstractmethod
+    def set_search_limits(self, max_depth: Optional[int], time_budget_s: Optional[float]):
+        pass
+
+    @abstractmethod
+    def update(self, word: str, res: GuessResult):
+        pass
+
+    @abstractmethod
+    def reset(self):
+        pass
+
+    @abstractmethod
+    def profile_stats(self) -> ProfileStats:
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
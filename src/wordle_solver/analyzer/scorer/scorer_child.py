@@ -1,118 +1,289 @@
 from collections import defaultdict, deque
 from decimal import Decimal
-from functools import lru_cache
+import math
+from multiprocessing.connection import Connection
 import numpy as np
+import signal
 import time
-from typing import Iterable, Optional
-from uuid import uuid4
+from typing import Any, Callable, Iterable, Optional
 
-from wordle_solver.common.guess_result import GuessResult, to_res_arr
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES, TranspositionTable
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus, CorpusHandle, attach_corpus
+from wordle_solver.common.guess_result import GuessResult, from_pattern_id, patterns_to_res_arrs, to_pattern_id, to_res_arr
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
 from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
 from wordle_solver.common.word_reducer import WordReducer
-from wordle_solver.common.word_reducer_constants import SOLVED
+from wordle_solver.common.word_reducer_constants import SOLVED_PATTERN
+from wordle_solver.util.profiler import ProfileStats, Profiler
 
 GUESS_THRESHOLD = Decimal('0.5')
 FULL_FAIL_SCORE = 100
 
-_CHILD = None
-
-
-def init_scorer_child(words: list[str], starting_guesses: int, max_guesses: int, max_depth: int):
-    global _CHILD
-    _CHILD = ScorerChild(words, starting_guesses, max_guesses, max_depth)
+# float64 EVs stay within this absolute distance of the Decimal reference mode (exact=True)
+EV_TOLERANCE = 1e-9
+# a guess is only cut off once its lower bound clears the bound by this much, so float noise never cuts a tie
+PRUNE_SLACK = 1e-9
 
+PROCESS = 'process'
+PROCESS_MANY = 'process_many'
+PROCESS_STATE = 'process_state'
+SET_STATE = 'set_state'
+SET_LIMITS = 'set_limits'
+PREPARE = 'prepare'
+UPDATE = 'update'
+RESET = 'reset'
+STATS = 'stats'
+STOP = 'stop'
 
-def process(word_i):
-    return _CHILD.process_word(word_i)
+type History = tuple[tuple[str, int], ...]
 
+_CHILD = None
+_CORPUS_BLOCKS = None
+
+
+def init_scorer_child(
+        words: list[str],
+        starting_guesses: int,
+        max_guesses: int,
+        max_depth: int,
+        exact: bool = False,
+        corpus_handle: Optional[CorpusHandle] = None,
+        cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        pruning: bool = True,
+        candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+        num_ranked: int = DEFAULT_NUM_RANKED,
+        profile: bool = False):
+    global _CHILD, _CORPUS_BLOCKS
+    corpus = None
+    if corpus_handle is not None:
+        corpus, _CORPUS_BLOCKS = attach_corpus(corpus_handle)
+    _CHILD = ScorerChild(words, starting_guesses, max_guesses, max_depth, exact, corpus, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile)
+
+
+def run_scorer_child(conn: Connection, *init_args: Any):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_scorer_child(*init_args)
+    serve_scorer_child(_CHILD, conn)
+
+
+def serve_scorer_child(child: 'ScorerChild', conn: Connection, send: Optional[Callable[[Any], None]] = None):
+    # serves (command, args) messages from the pool until told to stop, every message gets exactly one reply
+    if send is None:
+        send = conn.send
+    commands = {
+        PROCESS: child.process_word,
+        PROCESS_MANY: child.process_words,
+        PROCESS_STATE: child.process_state,
+        SET_STATE: child.set_state,
+        SET_LIMITS: child.set_search_limits,
+        PREPARE: child.prepare,
+        UPDATE: child.update,
+        RESET: child.reset,
+        STATS: child.profile_stats,
+    }
+
+    while True:
+        try:
+            command, args = conn.recv()
+        except EOFError:
+            return
+        if command == STOP:
+            return
+
+        try:
+            send((True, commands[command](*args)))
+        except Exception as e:
+            send((False, e))
+
+
+def is_terminal(max_guesses: int, max_depth: int, curr_guesses: int, curr_depth: int) -> bool:
+    return curr_guesses + curr_depth + 1 == max_guesses or curr_depth == max_depth
+
+
+def get_base_word_and_distr(
+        word_reducer: WordReducer,
+        max_guesses: int,
+        max_depth: int,
+        curr_guesses: int,
+        curr_depth: int,
+        exact: bool = False) -> Optional[tuple[str, float | Decimal]]:
+    one = Decimal(1) if exact else 1.0
 
-def prepare(args):
-    process_id, word_idxs = args
-    return _CHILD.prepare(process_id, word_idxs)
+    num_answers = word_reducer.num_answers()
+    if num_answers == 1:
+        return word_reducer.get_arbitrary_word(), one
 
+    if not is_terminal(max_guesses, max_depth, curr_guesses, curr_depth):
+        return None
 
-def update(args) -> str:
-    update_id, word, res = args
-    return _CHILD.update(update_id, word, res)
+    highest_freq, highest_word = word_reducer.get_top_freq(exact)
+    return highest_word, highest_freq + (one - highest_freq) * FULL_FAIL_SCORE
 
 
-def reset(reset_id: int) -> str:
-    return _CHILD.reset(reset_id)
-
-
-def get_base_word_and_distr(word_reducer: WordReducer, max_guesses: int, max_depth: int, curr_guesses: int, curr_depth: int) -> Optional[tuple[str, Decimal]]:
-    num_answers = word_reducer.num_answers()
-    if num_answers == 1:
-        return word_reducer.get_arbitrary_word(), Decimal(1)
-    
-    highest_freq, highest_word = word_reducer.get_top_freq()
-    total_guess_num = curr_guesses + curr_depth + 1
-    if total_guess_num == max_guesses:
-        return highest_word, highest_freq + (Decimal(1) - highest_freq) * Decimal(FULL_FAIL_SCORE)
-    elif curr_depth == max_depth:
-        return highest_word, highest_freq + (Decimal(1) - highest_freq) * Decimal(FULL_FAIL_SCORE)
-    else:
-        return None
+class SearchTimeout(Exception):
+    pass
 
 
 class ScorerChild:
-    def __init__(self, words: list[str], starting_guesses: int, max_guesses: int, max_depth: int):
+    def __init__(
+            self,
+            words: list[str],
+            starting_guesses: int,
+            max_guesses: int,
+            max_depth: int,
+            exact: bool = False,
+            corpus: Optional[Corpus] = None,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False,
+            check_keys: bool = False):
         self._words = words
+        self._exact = exact
+        self._pruning = pruning
+        self._candidate_ranking = candidate_ranking
+        self._num_ranked = num_ranked
+        self._corpus = Corpus.from_words(words) if corpus is None else corpus
+        # the process that started this worker already reported a stale matrix
+        self._pattern_matrix = load_pattern_matrix(words, warn=False)
         self._ss = SolveStatusNp()
-        self._word_reducer = WordReducer(words, self._ss)
-        self._id = str(uuid4())
-        self._prepare_id = -1
-        self._update_id = -1
-        self._reset_id = -1
+        self._word_reducer = WordReducer(words, self._ss, self._pattern_matrix, self._corpus, candidate_ranking, num_ranked)
 
+        self._base_max_depth = max_depth
         self._max_depth = max_depth
+        self._deadline: Optional[float] = None
         self._max_guesses = max_guesses
         self._starting_guesses = starting_guesses
         self._curr_guesses = starting_guesses
 
         self._candidate_words = None
         self._curr_depth = None
+        self._history: History = ()
 
-    def prepare(self, prepare_id: int, candidate_words: list[int]):
-        if prepare_id == self._prepare_id:
-            time.sleep(0.5)
-            return self._id
-        
+        self._table = TranspositionTable(cache_budget_bytes)
+        self._nodes_expanded = 0
+        self._cutoffs = 0
+        self._profiler = Profiler(profile)
+        # debug mode, remembers the survivors behind every key to catch hash collisions
+        self._check_keys = check_keys
+        self._key_survivors: dict[bytes, bytes] = {}
+
+    def prepare(self, candidate_words: Optional[list[int]]):
         self._candidate_words = candidate_words
-        self._prepare_id = prepare_id
-        return self._id
+        self._table.clear()
+
+    def set_search_limits(self, max_depth: Optional[int], time_budget_s: Optional[float]):
+        # None restores the configured depth, searches still running past the budget give up and score as None
+        # the table stays valid across depths since its keys carry the remaining depth
+        self._max_depth = self._base_max_depth if max_depth is None else max_depth
+        self._deadline = None if time_budget_s is None else time.monotonic() + time_budget_s
     
-    def _get_single_guess_ev(self, guess_i: int) -> Decimal:
+    def _get_single_guess_ev(self, guess_i: int, bound: float = math.inf) -> Optional[float | Decimal]:
+        # None means the guess provably scores above bound, any returned value is exact
+        if self._exact:
+            return self._get_single_guess_ev_exact(guess_i)
+        if not self._pruning:
+            bound = math.inf
+
+        with self._profiler.time('distribution'):
+            _, patterns, weights, top_weights, sizes, top_freqs, total_freqs, bucket_idxs = self._word_reducer.get_guess_buckets(guess_i)
+        unsolved = patterns != SOLVED_PATTERN
+        total_weight = np.sum(weights)
+
+        # every bucket pays for this guess, unsolved ones also for the best follow up
+        evs = np.ones(len(weights))
+        if is_terminal(self._max_guesses, self._max_depth, self._curr_guesses, self._curr_depth + 1):
+            with self._profiler.time('aggregation'):
+                top_shares = top_freqs / total_freqs
+                leaf_evs = np.where(sizes == 1, 1.0, top_shares + (1.0 - top_shares) * FULL_FAIL_SCORE)
+                evs[unsolved] += leaf_evs[unsolved]
+                return float(np.dot(weights, evs) / total_weight)
+
+        evs[unsolved & (sizes == 1)] += 1.0
+        open_buckets = np.flatnonzero(unsolved & (sizes > 1))
+        # the follow up solves at most the likeliest answer of a bucket, the rest need at least one guess more
+        top_shares = np.divide(top_weights[open_buckets], weights[open_buckets], out=np.ones(len(open_buckets)), where=weights[open_buckets] > 0)
+        evs[open_buckets] += 2.0 - top_shares
+
+        partial = np.dot(weights, evs)
+        limit = (bound + PRUNE_SLACK) * total_weight
+        bucket_survivors = None
+        for j in open_buckets[np.argsort(-weights[open_buckets], kind='stable')]:
+            if partial > limit:
+                self._cutoffs += 1
+                return None
+
+            lower = evs[j]
+            child_bound = math.inf if weights[j] == 0 else (limit - partial) / weights[j] + lower - 1.0
+            if bucket_survivors is None:
+                with self._profiler.time('filter'):
+                    bucket_survivors = self._word_reducer.get_bucket_survivors(bucket_idxs, sizes)
+            self._word_reducer.push(bucket_survivors[j])
+            try:
+                child_ev = self._best_ev_cached(child_bound)
+            finally:
+                self._word_reducer.undo()
+
+            if child_ev is None:
+                self._cutoffs += 1
+                return None
+            evs[j] = 1.0 + child_ev
+            partial += weights[j] * (evs[j] - lower)
+
+        return float(np.dot(weights, evs) / total_weight)
+
+    def _get_single_guess_ev_exact(self, guess_i: int) -> Decimal:
         res = Decimal(0)
-        guess_arr, res_arrs, weights = self._word_reducer.get_guess_distr_and_counts(guess_i)
+        guess_arr, patterns, weights = self._word_reducer.get_guess_distr_and_counts(guess_i)
         
-        for res_arr, weight in zip(res_arrs, weights):
-            if np.array_equal(res_arr, SOLVED):
+        for pattern, weight in zip(patterns, weights):
+            if pattern == SOLVED_PATTERN:
                 res += Decimal(weight)
 
             else:
-                self._ss.try_add_word(guess_arr, res_arr)
-                key = self._ss.key()
-                res += (Decimal(1) + self._best_ev_cached(key)) * Decimal(weight)
-                self._ss.undo()
+                # only buckets that recurse need the solve status form of their pattern
+                self._ss.try_add_word(guess_arr, patterns_to_res_arrs(guess_arr, pattern[None])[0])
+                self._word_reducer.try_update()
+                try:
+                    res += (Decimal(1) + self._best_ev_cached(math.inf)) * Decimal(weight)
+                finally:
+                    self._word_reducer.undo()
+                    self._ss.undo()
 
         res /= Decimal(np.sum(weights))
 
         return res
     
-    @lru_cache(maxsize=1000000)
-    def _best_ev_cached(self, tup):
-        self._curr_depth += 1
-        self._word_reducer.try_update()
-        next_ev = self._best_ev()
-        self._word_reducer.undo()
+    def _best_ev_cached(self, bound: float) -> Optional[float | Decimal]:
+        # the reducer already sits on the child survivors, which alone decide its ev
+        depth = self._curr_depth + 1
+        key = self._word_reducer.get_survivor_key()
+        if self._check_keys:
+            self._check_key(key)
+        table_key = (key, self._max_guesses - self._curr_guesses - depth, self._max_depth - depth)
+        if (cached := self._table.get(table_key)) is not None:
+            return cached
+
+        start_nodes = self._nodes_expanded
+        self._curr_depth = depth
+        next_ev = self._best_ev(bound)
         self._curr_depth -= 1
 
+        # a cut off search only proves a lower bound, so it is not cached
+        if next_ev is not None:
+            self._table.put(table_key, next_ev, self._nodes_expanded - start_nodes)
         return next_ev
 
-    def _best_ev(self) -> deque[Decimal]:
+    def _best_ev(self, bound: float) -> Optional[float | Decimal]:
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise SearchTimeout()
+        self._nodes_expanded += 1
+        if self._profiler.enabled:
+            self._profiler.count(f'nodes_depth_{self._curr_depth}')
         if (base_res := get_base_word_and_distr(
-            self._word_reducer, self._max_guesses, self._max_depth, self._curr_guesses, self._curr_depth)) is not None:
+            self._word_reducer, self._max_guesses, self._max_depth, self._curr_guesses, self._curr_depth, self._exact)) is not None:
             return base_res[1]
 
         # candidate_guesses = self._candidate_guesser.get_candidate_guesses(list(trie.trie_words), solve_status)
@@ -121,37 +292,84 @@ class ScorerChild:
         else:
             candidate_guesses = self._candidate_words
         
-        return min(self._get_single_guess_ev(i) for i in candidate_guesses)
+        best = None
+        cut_off = False
+        for i in candidate_guesses:
+            ev = self._get_single_guess_ev(i, bound if best is None else min(bound, best))
+            if ev is None:
+                cut_off = True
+            elif best is None or ev < best:
+                best = ev
+        # a cut off guess is only known to score above bound, so a best above bound is no exact minimum
+        if cut_off and best is not None and best > bound:
+            return None
+        return best
+
+    def _check_key(self, key: bytes):
+        survivors = self._word_reducer.get_survivors().tobytes()
+        if self._key_survivors.setdefault(key, survivors) != survivors:
+            raise RuntimeError(f'survivor key collision on {key.hex()}')
 
     # depth will never be zero in this function
-    def process_word(self, word_i: int) -> Decimal:
+    def process_word(self, word_i: int, bound: float = math.inf) -> Optional[float | Decimal]:
+        # None when word_i provably scores above bound or its search ran out of time
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return None
         self._curr_depth = 0
-        return self._get_single_guess_ev(word_i)
-
-    def update(self, update_id: int, word: str, res: GuessResult) -> str:
-        if update_id == self._update_id:
-            time.sleep(0.5)
-            return self._id
-
+        with self._profiler.time('candidate'):
+            try:
+                return self._get_single_guess_ev(word_i, bound)
+            except SearchTimeout:
+                return None
+
+    def process_words(self, word_idxs: list[int], bound: float = math.inf, bounded: bool = True) -> list[Optional[float | Decimal]]:
+        # bounded searches each word against the best of the bound and the words before it, otherwise every ev is exact
+        ret = []
+        for i in word_idxs:
+            ev = self.process_word(i, bound)
+            if bounded and ev is not None and ev < bound:
+                bound = ev
+            ret.append(ev)
+        return ret
+
+    def process_state(self, history: History, word_i: int) -> Optional[float | Decimal]:
+        # scores word_i from the state history leads to
+        self.set_state(history)
+        return self.process_word(word_i)
+
+    def set_state(self, history: History):
+        # replays history, starting over only when the child is not already on the way there
+        if history == self._history:
+            return
+        if history[:len(self._history)] != self._history:
+            self.reset()
+        for word, pattern_id in history[len(self._history):]:
+            self.update(word, from_pattern_id(pattern_id))
+
+    def cache_stats(self) -> dict[str, int]:
+        return self._table.stats()
+
+    def search_stats(self) -> dict[str, int]:
+        return {'nodes_expanded': self._nodes_expanded, 'cutoffs': self._cutoffs}
+
+    def profile_stats(self) -> ProfileStats:
+        return self._profiler.stats(self.search_stats() | {
+            'table_hits': self._table.hits,
+            'table_misses': self._table.misses,
+            'table_evictions': self._table.evictions,
+        })
+
+    def update(self, word: str, res: GuessResult):
         res_arr = to_res_arr(word, res)
         word_arr = self._word_reducer.get_guess_arr(word)
         self._ss.update(word_arr, res_arr)
         self._word_reducer.update()
         self._curr_guesses += 1
+        self._history += ((word, to_pattern_id(res)),)
 
-        self._udpate_id = update_id
-        return self._id
-
-    def reset(self, reset_id: int) -> str:
-        if reset_id == self._reset_id:
-            time.sleep(0.5)
-            return self._id
-        
+    def reset(self):
         self._ss = SolveStatusNp()
-        self._word_reducer = WordReducer(self._words, self._ss)
-        self._update_id = -1
-        self._prepare_id = -1
+        self._word_reducer = WordReducer(self._words, self._ss, self._pattern_matrix, self._corpus, self._candidate_ranking, self._num_ranked)
         self._curr_guesses = self._starting_guesses
-
-        self._reset_id = reset_id
-        return self._id
+        self._history = ()
+        self._table.clear()
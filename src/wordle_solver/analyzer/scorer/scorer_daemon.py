@@ -0,0 +1,117 @@
+import ipaddress
+from multiprocessing.connection import AuthenticationError, Connection, Listener
+import os
+import signal
+import threading
+from typing import Any, Optional
+
+from wordle_solver.analyzer.scorer.scorer_child import ScorerChild, serve_scorer_child
+from wordle_solver.analyzer.scorer.scorer_pool import HEARTBEAT
+from wordle_solver.common.corpus import load_corpus
+
+# the daemon unpickles what clients send, so the public default key is only accepted on loopback
+DEFAULT_AUTHKEY = b'wordle-solver'
+AUTHKEY_ENV = 'WORDLE_SOLVER_AUTHKEY'
+HEARTBEAT_INTERVAL_SECONDS = 1.0
+# the first message of every client, its args are the ScorerChild arguments past the corpus
+INIT = 'init'
+
+type Address = tuple[str, int]
+
+
+def parse_address(s: str) -> Address:
+    host, _, port = s.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def get_authkey() -> bytes:
+    authkey = os.environ.get(AUTHKEY_ENV)
+    return DEFAULT_AUTHKEY if not authkey else authkey.encode()
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def run_scorer_daemon(address: Address, authkey: bytes = DEFAULT_AUTHKEY, ready: Optional[Connection] = None):
+    # serves one client at a time, the ScorerChild is kept warm for the next client with the same arguments
+    if authkey == DEFAULT_AUTHKEY and not is_loopback(address[0]):
+        raise ValueError(f'listening on {address[0]} needs an authkey other than the default, pass --authkey or set {AUTHKEY_ENV}')
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    corpus = load_corpus()
+    child = None
+    child_args = None
+
+    with Listener(address, authkey=authkey) as listener:
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError):
+                continue
+
+            with conn:
+                try:
+                    command, init_args = conn.recv()
+                    if command != INIT:
+                        continue
+                    if init_args != child_args:
+                        # cleared first so a failed build is retried rather than reused
+                        child = None
+                        child_args = None
+                        child = _build_child(corpus, *init_args)
+                        child_args = init_args
+                    else:
+                        child.prepare(None)
+                        child.set_search_limits(None, None)
+                        child.reset()
+                    conn.send((True, None))
+                except (EOFError, OSError):
+                    continue
+                except Exception as e:
+                    conn.send((False, e))
+                    continue
+
+                _serve_with_heartbeats(child, conn)
+
+
+def _build_child(corpus, words: list[str], *args: Any) -> ScorerChild:
+    starting_guesses, max_guesses, max_depth, exact, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile = args
+    if corpus.words.tolist() != words:
+        corpus = None
+    return ScorerChild(words, starting_guesses, max_guesses, max_depth, exact, corpus, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile)
+
+
+def _serve_with_heartbeats(child: ScorerChild, conn: Connection):
+    # a beat goes out every interval, also in the middle of a search, so clients can tell a slow worker from a lost one
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def send(message: Any):
+        with lock:
+            conn.send(message)
+
+    def beat():
+        while not stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                send(HEARTBEAT)
+            except OSError:
+                return
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        serve_scorer_child(child, conn, send)
+    except OSError:
+        pass
+    finally:
+        stop.set()
+        thread.join()
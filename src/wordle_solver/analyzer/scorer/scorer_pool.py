@@ -1,64 +1,365 @@
+from collections import deque
 from decimal import Decimal
-from itertools import repeat
-from multiprocessing import Pool
+import math
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
 from tqdm import tqdm
-from typing import Iterable
+import time
+from typing import Any, Callable, Iterable, Optional
+import weakref
 
-from wordle_solver.analyzer.scorer.scorer_child import init_scorer_child, prepare, process, update, reset
-from wordle_solver.common.guess_result import GuessResult
+from wordle_solver.analyzer.scorer.scorer_child import PREPARE, PROCESS_MANY, PROCESS_STATE, RESET, SET_LIMITS, SET_STATE, STATS, STOP, UPDATE, History, ScorerChild, run_scorer_child
+from wordle_solver.analyzer.scorer.scorer_backend import ScorerBackend, WorkerLostError
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus, SharedCorpus
+from wordle_solver.common.guess_result import GuessResult, to_pattern_id
+from wordle_solver.util.profiler import ProfileStats, Profiler, merge_stats
 
+SHUTDOWN_TIMEOUT_SECONDS = 5
+# guided chunks, a worker takes this share of the remaining work split evenly, so chunks shrink toward the end
+CHUNK_DIVISOR = 4
+MAX_CHUNK = 16
 
-class ScorerPool:
+
+# replies are (ok, value), remote workers also send (None, None) while busy to show they are alive
+HEARTBEAT = (None, None)
+CONNECTION_ERRORS = (EOFError, OSError)
+
+
+def _recv(conn: Connection) -> Any:
+    while (reply := conn.recv()) == HEARTBEAT:
+        pass
+
+    ok, value = reply
+    if not ok:
+        raise value
+    return value
+
+
+def start_scorer_workers(num_processes: int, init_args: tuple) -> tuple[list[Connection], list[Process]]:
+    conns = []
+    processes = []
+    for _ in range(num_processes):
+        conn, child_conn = Pipe()
+        process = Process(target=run_scorer_child, args=(child_conn, *init_args), daemon=True)
+        process.start()
+        child_conn.close()
+
+        conns.append(conn)
+        processes.append(process)
+
+    return conns, processes
+
+
+def shutdown_scorer_workers(conns: list[Connection], processes: list[Process], shared_corpus: SharedCorpus):
+    for conn in conns:
+        try:
+            conn.send((STOP, ()))
+        except (BrokenPipeError, OSError):
+            pass
+
+    for process in processes:
+        process.join(SHUTDOWN_TIMEOUT_SECONDS)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    for conn in conns:
+        conn.close()
+    shared_corpus.close()
+
+
+class ConnectionScorerPool(ScorerBackend):
+    # scheduling shared by backends whose workers sit behind a Connection, every message gets exactly one reply
+    def __init__(self, progress_bar: bool, profile: bool, heartbeat_timeout: Optional[float] = None):
+        self._conns: list[Connection] = []
+        self._progress_bar = progress_bar
+        self._profiler = Profiler(profile)
+        # without a timeout workers are only lost once their connection breaks
+        self._heartbeat_timeout = heartbeat_timeout
+        self._history: History = ()
+        self._candidate_words: Optional[list[int]] = None
+        # max depth and monotonic deadline the workers search under, None while they use their configured depth
+        self._search_limits: Optional[tuple[Optional[int], Optional[float]]] = None
+
+    def process(self, indexes: Iterable[int], num_items: int, bounded: bool = False) -> Iterable[float | Decimal]:
+        # bounded only keeps the minimum exact, indexes that provably score worse come back as inf
+        with self._profiler.time('pool_process'):
+            return self._process(list(indexes), bounded)
+
+    def _process(self, indexes: list[int], bounded: bool) -> Iterable[float | Decimal]:
+        # idle workers pull the next chunk along with the best ev seen so far, results are returned in the order of indexes
+        results: list[Optional[float | Decimal]] = [None] * len(indexes)
+        retries: deque[tuple[int, int]] = deque()
+        next_pos = 0
+        best = math.inf
+        progress = tqdm(total=len(indexes)) if self._progress_bar else None
+
+        def next_job(conn: Connection) -> Optional[tuple[tuple[int, int], tuple]]:
+            nonlocal next_pos
+            if retries:
+                start, stop = retries.popleft()
+            elif next_pos < len(indexes):
+                remaining = len(indexes) - next_pos
+                start, stop = next_pos, next_pos + max(1, min(MAX_CHUNK, remaining // (CHUNK_DIVISOR * len(self._conns))))
+                next_pos = stop
+            else:
+                return None
+            return (start, stop), (PROCESS_MANY, (indexes[start:stop], best if bounded else math.inf, bounded))
+
+        def on_done(job: tuple[int, int], chunk: list[Optional[float | Decimal]]):
+            nonlocal best
+            results[job[0]:job[1]] = chunk
+            best = min([best, *(ev for ev in chunk if ev is not None)])
+            if progress is not None:
+                progress.update(len(chunk))
+
+        self._run_jobs(next_job, on_done, retries.append)
+
+        if progress is not None:
+            progress.close()
+        return [math.inf if ev is None else ev for ev in results]
+
+    def process_states(self, items: list[tuple[History, int]]) -> list[float | Decimal]:
+        with self._profiler.time('pool_process_states'):
+            results = self._process_states(items)
+        # the batch leaves workers on arbitrary states, put them back on the current game
+        self._broadcast(SET_STATE, self._history)
+        return results
+
+    def _process_states(self, items: list[tuple[History, int]]) -> list[float | Decimal]:
+        # an idle worker keeps to the state it is on, otherwise it takes a state nobody works on, so replays stay rare
+        queues: dict[History, deque[tuple[int, int]]] = {}
+        for pos, (history, word_i) in enumerate(items):
+            queues.setdefault(history, deque()).append((pos, word_i))
+
+        results = {}
+        worker_histories: dict[Connection, History] = {}
+        progress = tqdm(total=len(items)) if self._progress_bar else None
+
+        def next_job(conn: Connection) -> Optional[tuple[tuple[History, int, int], tuple]]:
+            if not queues:
+                return None
+            history = worker_histories.get(conn)
+            if history not in queues:
+                taken = set(worker_histories.values())
+                history = next((h for h in queues if h not in taken), max(queues, key=lambda h: len(queues[h])))
+
+            pos, word_i = queues[history].popleft()
+            if not queues[history]:
+                del queues[history]
+            worker_histories[conn] = history
+            return (history, pos, word_i), (PROCESS_STATE, (history, word_i))
+
+        def on_done(job: tuple[History, int, int], ev: float | Decimal):
+            results[job[1]] = ev
+            if progress is not None:
+                progress.update()
+
+        def retry(job: tuple[History, int, int]):
+            history, pos, word_i = job
+            queues.setdefault(history, deque()).appendleft((pos, word_i))
+
+        self._run_jobs(next_job, on_done, retry)
+
+        if progress is not None:
+            progress.close()
+        return [results[i] for i in range(len(items))]
+
+    def prepare(self, indexes: Optional[list[int]]):
+        self._candidate_words = indexes
+        self._broadcast(PREPARE, indexes)
+
+    def set_search_limits(self, max_depth: Optional[int], time_budget_s: Optional[float]):
+        self._search_limits = None if max_depth is None and time_budget_s is None else (max_depth, None if time_budget_s is None else time.monotonic() + time_budget_s)
+        self._broadcast(SET_LIMITS, max_depth, time_budget_s)
+
+    def update(self, word: str, res: GuessResult):
+        self._history += ((word, to_pattern_id(res)),)
+        self._broadcast(UPDATE, word, res)
+
+    def reset(self):
+        self._history = ()
+        self._broadcast(RESET)
+
+    def profile_stats(self) -> ProfileStats:
+        return merge_stats([self._profiler.stats({'pool_workers': len(self._conns)}), *self._broadcast(STATS)])
+
+    def _replace_lost(self, conn: Connection, reconnect: bool = True) -> Optional[Connection]:
+        # returns the connection taking over for conn, already on the current state, or None once the worker is dropped
+        # a worker that went silent may still accept connections it never serves, so it is not reconnected
+        raise WorkerLostError('a scorer worker exited')
+
+    def _run_jobs(
+            self,
+            next_job: Callable[[Connection], Optional[tuple[Any, tuple]]],
+            on_done: Callable[[Any, Any], None],
+            retry: Callable[[Any], None]):
+        # keeps every worker busy with next_job, the job of a lost worker goes back through retry
+        in_flight: dict[Connection, Any] = {}
+        last_seen: dict[Connection, float] = {}
+
+        def send_next(conn: Connection):
+            while (item := next_job(conn)) is not None:
+                job, message = item
+                try:
+                    conn.send(message)
+                except CONNECTION_ERRORS:
+                    retry(job)
+                    if (conn := self._replace_lost(conn)) is None:
+                        return
+                    continue
+
+                in_flight[conn] = job
+                last_seen[conn] = time.monotonic()
+                return
+
+        def lose(conn: Connection, reconnect: bool = True):
+            retry(in_flight.pop(conn))
+            if (replacement := self._replace_lost(conn, reconnect)) is not None:
+                send_next(replacement)
+            # jobs waiting on no one go to any idle worker that is left
+            for idle in self._conns:
+                if idle not in in_flight:
+                    send_next(idle)
+
+        for conn in list(self._conns):
+            send_next(conn)
+
+        while in_flight:
+            for conn in wait(list(in_flight), self._heartbeat_timeout):
+                try:
+                    reply = conn.recv()
+                except CONNECTION_ERRORS:
+                    lose(conn)
+                    continue
+
+                last_seen[conn] = time.monotonic()
+                if reply == HEARTBEAT:
+                    continue
+                job = in_flight.pop(conn)
+                ok, value = reply
+                if not ok:
+                    raise value
+                on_done(job, value)
+                send_next(conn)
+
+            if self._heartbeat_timeout is not None:
+                now = time.monotonic()
+                for conn in [conn for conn in in_flight if now - last_seen[conn] > self._heartbeat_timeout]:
+                    lose(conn, reconnect=False)
+
+    def _broadcast(self, command: str, *args: Any) -> list[Any]:
+        # lost workers are replaced on the already updated state, so they drop out of the replies
+        sent = []
+        for conn in list(self._conns):
+            try:
+                conn.send((command, args))
+                sent.append(conn)
+            except CONNECTION_ERRORS:
+                self._replace_lost(conn)
+
+        ret = []
+        for conn in sent:
+            try:
+                ret.append(_recv(conn))
+            except CONNECTION_ERRORS:
+                self._replace_lost(conn)
+        return ret
+
+
+class ScorerPool(ConnectionScorerPool):
+    # every worker is a local process that owns one pipe, so a broadcast is one message and one reply per worker
     def __init__(
             self,
             num_processes: int,
-            words: list[int],
+            words: list[str],
+            starting_guesses: int,
+            max_guesses: int,
+            max_depth: int,
+            progress_bar: bool,
+            exact: bool = False,
+            corpus: Optional[Corpus] = None,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False):
+        super().__init__(progress_bar, profile)
+        if corpus is None:
+            corpus = Corpus.from_words(words)
+        # workers attach to these arrays instead of each building their own
+        self._shared_corpus = SharedCorpus(corpus)
+
+        init_args = (words, starting_guesses, max_guesses, max_depth, exact, self._shared_corpus.handle, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile)
+        self._conns, self._processes = start_scorer_workers(num_processes, init_args)
+        self._finalizer = weakref.finalize(self, shutdown_scorer_workers, self._conns, self._processes, self._shared_corpus)
+
+    def close(self):
+        self._finalizer()
+
+
+class LocalScorerPool(ScorerBackend):
+    # same surface as ScorerPool but scores in the calling process, for callers that parallelize above the pool
+    def __init__(
+            self,
+            words: list[str],
             starting_guesses: int,
             max_guesses: int,
             max_depth: int,
-            progress_bar: bool):
-        self._update_id = 0
-        self._reset_id = 0
-        self._prepare_id = 0
-        self._num_processes = num_processes
+            progress_bar: bool,
+            exact: bool = False,
+            corpus: Optional[Corpus] = None,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False):
         self._progress_bar = progress_bar
-        self._pool = Pool(
-            processes=num_processes,
-            initializer=init_scorer_child,
-            initargs=(words, starting_guesses, max_guesses, max_depth))
+        self._history: History = ()
+        self._child = ScorerChild(words, starting_guesses, max_guesses, max_depth, exact, corpus, cache_budget_bytes, pruning, candidate_ranking, num_ranked, profile)
 
-    def process(self, indexes: Iterable[int], num_items: int) -> Iterable[Decimal]:
+    def close(self):
+        pass
+
+    def process(self, indexes: Iterable[int], num_items: int, bounded: bool = False) -> Iterable[float | Decimal]:
         if self._progress_bar:
-            return list(tqdm(self._pool.imap(process, indexes), total=num_items))
-        else:
-            return list(self._pool.imap(process, indexes))
-        
-    def prepare(self, indexes: list[int]):
-        finished = set()
+            indexes = tqdm(indexes, total=num_items)
 
-        while len(finished) < self._num_processes:
-            ret = self._pool.map(prepare, zip(repeat(self._prepare_id, self._num_processes), repeat(indexes, self._num_processes)))
-            for child_id in ret:
-                finished.add(child_id)
+        results = []
+        best = math.inf
+        for i in indexes:
+            ev = self._child.process_word(i, best if bounded else math.inf)
+            if ev is not None and ev < best:
+                best = ev
+            results.append(math.inf if ev is None else ev)
+        return results
 
-        self._prepare_id += 1
+    def process_states(self, items: list[tuple[History, int]]) -> list[float | Decimal]:
+        # visiting states in sorted order keeps replays to the suffix that differs
+        order = sorted(range(len(items)), key=lambda pos: items[pos][0])
+        results = [None] * len(items)
+        for pos in (tqdm(order) if self._progress_bar else order):
+            results[pos] = self._child.process_state(*items[pos])
 
-    def update(self, word: str, res: GuessResult):
-        finished = set()
+        self._child.set_state(self._history)
+        return results
 
-        while len(finished) < self._num_processes:
-            ret = self._pool.map(update, zip(repeat(self._update_id, self._num_processes), repeat(word, self._num_processes), repeat(res, self._num_processes)))
-            for child_id in ret:
-                finished.add(child_id)
+    def prepare(self, indexes: Optional[list[int]]):
+        self._child.prepare(indexes)
 
-        self._update_id += 1
+    def set_search_limits(self, max_depth: Optional[int], time_budget_s: Optional[float]):
+        self._child.set_search_limits(max_depth, time_budget_s)
+
+    def update(self, word: str, res: GuessResult):
+        self._child.update(word, res)
+        self._history += ((word, to_pattern_id(res)),)
 
     def reset(self):
-        finished = set()
+        self._child.reset()
+        self._history = ()
 
-        while len(finished) < self._num_processes:
-            ret = self._pool.map(reset, repeat(self._reset_id, self._num_processes))
-            for child_id in ret:
-                finished.add(child_id)
+    def profile_stats(self) -> ProfileStats:
+        return self._child.profile_stats()
 
-        self._reset_id += 1
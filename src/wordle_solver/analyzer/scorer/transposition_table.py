@@ -0,0 +1,77 @@
+from decimal import Decimal
+from sys import getsizeof
+from typing import Optional
+
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+# dict slot, key tuple with its two ints, value tuple with the ev and cost
+ENTRY_OVERHEAD_BYTES = 232
+# share of the entries dropped once the budget is exceeded, keeps eviction amortized O(log n) per insert
+EVICTION_FRACTION = 0.25
+
+# (survivor set key, remaining guesses, remaining search depth)
+type TableKey = tuple[bytes, int, int]
+
+
+class TranspositionTable:
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self._budget_bytes = budget_bytes
+        self._entries: dict[TableKey, tuple[float | Decimal, int]] = {}
+        self._num_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    def get(self, key: TableKey) -> Optional[float | Decimal]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: TableKey, ev: float | Decimal, cost: int):
+        if key not in self._entries:
+            self._num_bytes += self._entry_size(key)
+        self._entries[key] = (ev, cost)
+
+        if self._num_bytes > self._budget_bytes:
+            self._evict()
+
+    def items(self) -> list[tuple[TableKey, float | Decimal]]:
+        return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def clear(self):
+        self._entries = {}
+        self._num_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._num_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _evict(self):
+        # cheap and shallow subtrees are the cheapest to recompute, so they go first
+        num_evict = max(1, int(len(self._entries) * EVICTION_FRACTION))
+        by_priority = sorted(self._entries, key=lambda key: (self._entries[key][1], key[2]))
+
+        for key in by_priority[:num_evict]:
+            del self._entries[key]
+            self._num_bytes -= self._entry_size(key)
+        self.evictions += num_evict
+
+    @staticmethod
+    def _entry_size(key: TableKey) -> int:
+        return getsizeof(key[0]) + ENTRY_OVERHEAD_BYTES
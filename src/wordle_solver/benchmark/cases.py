@@ -0,0 +1,158 @@
+import numpy as np
+from typing import Callable
+
+from wordle_solver.analyzer.analyzer import Analyzer
+from wordle_solver.analyzer.scorer.scorer_child import ScorerChild
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.common.guess_result import get_guess_result, to_res_arr
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.executor.executor import Executor
+from wordle_solver.executor.parallelism import Parallelism
+from wordle_solver.util.utils import get_previous_answers
+
+SEED = 0
+NUM_FEEDBACKS = 200
+NUM_GUESSES = 200
+NUM_DEEP_GUESSES = 10
+NUM_ANSWERS = 10
+# every state below the opening is reached by this guess and answer
+STATE_GUESS = 'tares'
+STATE_ANSWER = 'robot'
+
+# a case does its untimed setup and returns the callable that gets timed
+type BenchmarkCase = Callable[[], Callable[[], object]]
+
+
+class _Fixture:
+    def __init__(self):
+        self.corpus = load_corpus()
+        self.words = self.corpus.words.tolist()
+        self.pattern_matrix = load_pattern_matrix(self.words)
+        rng = np.random.default_rng(SEED)
+        self.guesses = rng.choice(len(self.words), NUM_GUESSES, replace=False)
+        self.feedbacks = [
+            (self.corpus.words_arr[guess], to_res_arr(self.words[guess], get_guess_result(self.words[guess], self.words[answer])))
+            for guess, answer in rng.choice(len(self.words), (NUM_FEEDBACKS, 2))]
+        self.answers = list(rng.permutation(get_previous_answers())[:NUM_ANSWERS])
+
+    def state_reducer(self) -> tuple[SolveStatusNp, WordReducer]:
+        ss = SolveStatusNp()
+        reducer = WordReducer(self.words, ss, self.pattern_matrix, self.corpus)
+        ss.update(reducer.get_guess_arr(STATE_GUESS), to_res_arr(STATE_GUESS, get_guess_result(STATE_GUESS, STATE_ANSWER)))
+        reducer.update()
+        return ss, reducer
+
+    def state_child(self, max_depth: int) -> ScorerChild:
+        child = ScorerChild(self.words, 1, 6, max_depth, corpus=self.corpus)
+        child.update(STATE_GUESS, get_guess_result(STATE_GUESS, STATE_ANSWER))
+        return child
+
+
+_FIXTURE = None
+
+
+def _get_fixture() -> _Fixture:
+    global _FIXTURE
+    if _FIXTURE is None:
+        _FIXTURE = _Fixture()
+    return _FIXTURE
+
+
+def reducer_filter() -> Callable[[], object]:
+    fixture = _get_fixture()
+    ss = SolveStatusNp()
+    reducer = WordReducer(fixture.words, ss, fixture.pattern_matrix, fixture.corpus)
+
+    def run():
+        for guess_arr, res_arr in fixture.feedbacks:
+            ss.try_add_word(guess_arr, res_arr)
+            reducer.try_update()
+            reducer.undo()
+            ss.undo()
+    return run
+
+
+def guess_distr() -> Callable[[], object]:
+    fixture = _get_fixture()
+    _, reducer = fixture.state_reducer()
+
+    def run():
+        for i in fixture.guesses:
+            reducer.get_guess_distr_and_counts(i)
+    return run
+
+
+def survivor_key() -> Callable[[], object]:
+    fixture = _get_fixture()
+    ss = SolveStatusNp()
+    reducer = WordReducer(fixture.words, ss, fixture.pattern_matrix, fixture.corpus)
+    survivors = []
+    for guess_arr, res_arr in fixture.feedbacks:
+        ss.try_add_word(guess_arr, res_arr)
+        reducer.try_update()
+        survivors.append(reducer.get_survivors())
+        reducer.undo()
+        ss.undo()
+
+    def run():
+        for idxs in survivors:
+            reducer.push(idxs)
+            reducer.get_survivor_key()
+            reducer.undo()
+    return run
+
+
+def process_word_depth_1() -> Callable[[], object]:
+    fixture = _get_fixture()
+    child = fixture.state_child(1)
+
+    def run():
+        for i in fixture.guesses:
+            child.process_word(i)
+    return run
+
+
+def process_word_depth_2() -> Callable[[], object]:
+    fixture = _get_fixture()
+    child = fixture.state_child(2)
+
+    def run():
+        # a cold table every run, otherwise later repeats only measure cache hits
+        child.reset()
+        child.update(STATE_GUESS, get_guess_result(STATE_GUESS, STATE_ANSWER))
+        for i in fixture.guesses[:NUM_DEEP_GUESSES]:
+            child.process_word(i)
+    return run
+
+
+def best_guess_opening() -> Callable[[], object]:
+    fixture = _get_fixture()
+    analyzer = Analyzer(None, fixture.words, None, 1, 1, progress_bar=False, use_opening_book=False, in_process=True, corpus=fixture.corpus)
+
+    def run():
+        analyzer.reset()
+        return analyzer.get_best_guess()
+    return run
+
+
+def executor_answers() -> Callable[[], object]:
+    fixture = _get_fixture()
+    executor = Executor(None, 1, parallelism=Parallelism.Candidate, in_process=True, corpus=fixture.corpus)
+
+    def run():
+        executor.clear_cache()
+        return executor.solve_answers(fixture.answers)
+    return run
+
+
+CASES: dict[str, BenchmarkCase] = {
+    'reducer_filter': reducer_filter,
+    'guess_distr': guess_distr,
+    'survivor_key': survivor_key,
+    'process_word_depth_1': process_word_depth_1,
+    'process_word_depth_2': process_word_depth_2,
+    'best_guess_opening': best_guess_opening,
+    'executor_answers': executor_answers,
+}
@@ -0,0 +1,21 @@
+from wordle_solver.benchmark.runner import BenchmarkResults
+
+DEFAULT_THRESHOLD = 0.1
+
+# name, baseline seconds, current seconds, current / baseline
+type Comparison = tuple[str, float, float, float]
+
+
+def compare_results(baseline: BenchmarkResults, current: BenchmarkResults) -> list[Comparison]:
+    # cases missing from either side are skipped, min times are compared since they are the least noisy
+    ret = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        base = baseline['results'][name]['min']
+        ret.append((name, base, result['min'], result['min'] / base))
+    return ret
+
+
+def get_regressions(comparisons: list[Comparison], threshold: float = DEFAULT_THRESHOLD) -> list[Comparison]:
+    return [comparison for comparison in comparisons if comparison[3] > 1 + threshold]
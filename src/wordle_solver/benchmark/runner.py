@@ -0,0 +1,55 @@
+import json
+import numpy as np
+import os
+import platform
+import statistics
+import time
+from typing import Any, Iterable
+
+from wordle_solver.benchmark.cases import CASES
+
+RESULTS_VERSION = 1
+DEFAULT_REPEATS = 5
+
+type BenchmarkResults = dict[str, Any]
+
+
+def run_benchmarks(names: Iterable[str], repeats: int = DEFAULT_REPEATS, verbose: bool = True) -> BenchmarkResults:
+    results = {}
+    for name in names:
+        run = CASES[name]()
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        results[name] = {'min': min(times), 'median': statistics.median(times), 'repeats': repeats}
+        if verbose:
+            print(f'{name:>22} {min(times):>10.4f}s min {statistics.median(times):>10.4f}s median')
+
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+
+def save_results(results: BenchmarkResults, path: str):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def load_results(path: str) -> BenchmarkResults:
+    with open(path, 'r') as f:
+        results = json.load(f)
+
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f'{path} holds benchmark results version {results.get("version")}, expected {RESULTS_VERSION}')
+    return results
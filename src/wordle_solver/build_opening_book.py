@@ -0,0 +1,40 @@
+import argparse
+import os
+
+from wordle_solver.analyzer.analyzer import Analyzer
+from wordle_solver.analyzer.guess_store import get_strategy
+from wordle_solver.analyzer.opening_book import build_opening_book
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.util.constants import NUMBER_OF_GUESSES, OPENING_BOOK_PATH
+from wordle_solver.util.utils import get_best_starting_word
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--depth', type=int, default=2)
+parser.add_argument('-d', '--max_search_depth', type=int, default=1)
+parser.add_argument('--recompute_start', default=False, action='store_true')
+parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+parser.add_argument('-r', '--candidate_ranking', type=CandidateRanking.from_string, default=CandidateRanking.Heuristic)
+parser.add_argument('-k', '--num_ranked', type=int, default=DEFAULT_NUM_RANKED)
+parser.add_argument('-o', '--output', default=OPENING_BOOK_PATH)
+
+
+def main():
+    args = parser.parse_args()
+    corpus = load_corpus()
+    words = corpus.words.tolist()
+    starting_word = None if args.recompute_start else get_best_starting_word()
+    max_search_depth = min(args.max_search_depth, NUMBER_OF_GUESSES)
+
+    strategy = get_strategy(args.candidate_ranking, args.num_ranked, False, starting_word)
+
+    analyzer = Analyzer(None, words, starting_word, args.num_processes, max_search_depth, progress_bar=False, use_opening_book=False, corpus=corpus, candidate_ranking=args.candidate_ranking, num_ranked=args.num_ranked)
+    book = build_opening_book(analyzer, words, corpus, starting_word, max_search_depth, strategy, args.depth)
+    analyzer.close()
+
+    book.save(args.output)
+    print(f'Wrote {len(book)} states to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+import argparse
+
+from wordle_solver.common.pattern_matrix import build_pattern_matrix
+from wordle_solver.util.constants import PATTERN_MATRIX_PATH
+from wordle_solver.util.utils import read_all_words
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-o', '--output', default=PATTERN_MATRIX_PATH)
+
+
+def main():
+    args = parser.parse_args()
+
+    build_pattern_matrix(read_all_words(), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import numpy as np
+
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.util.constants import ALPHABET_LETTERS, WORD_LENGTH
+
+WORD_BITS = 64
+ALPHABET_IDXS = np.arange(ALPHABET_LETTERS, dtype=np.uint8)
+# past this many allowed letters it is cheaper to knock out the disallowed ones
+NE_BOUND = ALPHABET_LETTERS // 2
+
+
+def pack_bits(mask: np.ndarray) -> np.ndarray:
+    # packs the last axis of a bool array into little endian uint64 words
+    num_words = -(-mask.shape[-1] // WORD_BITS)
+    padded = np.zeros(mask.shape[:-1] + (num_words * WORD_BITS,), dtype=np.bool)
+    padded[..., :mask.shape[-1]] = mask
+    return np.packbits(padded, axis=-1, bitorder='little').view(np.uint64)
+
+
+def unpack_bits(bits: np.ndarray, num_items: int) -> np.ndarray:
+    return np.unpackbits(bits.view(np.uint8), count=num_items, bitorder='little').view(np.bool)
+
+
+def build_bitset_arrays(words_arr: np.ndarray, char_counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    counts = np.arange(WORD_LENGTH + 1)
+    pos_letter = words_arr.T[:, None, :] == ALPHABET_IDXS[None, :, None]
+    min_count = char_counts.T[:, None, :] >= counts[None, :, None]
+    exact_count = char_counts.T[:, None, :] == counts[None, :, None]
+
+    return pack_bits(pos_letter), pack_bits(min_count), pack_bits(exact_count)
+
+
+class BitsetIndex:
+    # one packed word set per (position, letter), per (letter, at least k copies) and per (letter, exactly k copies)
+    def __init__(self, num_words: int, pos_letter: np.ndarray, min_count: np.ndarray, exact_count: np.ndarray):
+        self._num_words = num_words
+        self._pos_letter = pos_letter
+        self._min_count = min_count
+        self._exact_count = exact_count
+        self._all = pack_bits(np.ones(num_words, dtype=np.bool))
+
+    def get_survivors(self, solve_status: SolveStatusNp) -> np.ndarray:
+        ret = self._all.copy()
+
+        for i, allowed in enumerate(solve_status.get_valids()):
+            num_allowed = np.count_nonzero(allowed)
+            if num_allowed == ALPHABET_LETTERS:
+                continue
+            elif num_allowed >= NE_BOUND:
+                ret &= ~np.bitwise_or.reduce(self._pos_letter[i, ~allowed], axis=0)
+            elif num_allowed > 0:
+                ret &= np.bitwise_or.reduce(self._pos_letter[i, allowed], axis=0)
+            else:
+                ret[:] = 0
+
+        lowers = solve_status.get_lowers()
+        for c in np.flatnonzero(lowers):
+            ret &= self._min_count[c, lowers[c]]
+
+        capped = solve_status.get_capped()
+        for c in np.flatnonzero(capped):
+            ret &= self._exact_count[c, capped[c]]
+
+        return ret
+
+    def get_survivor_mask(self, solve_status: SolveStatusNp) -> np.ndarray:
+        return unpack_bits(self.get_survivors(solve_status), self._num_words)
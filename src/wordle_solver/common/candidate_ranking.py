@@ -0,0 +1,27 @@
+from enum import Enum, auto
+from typing import Self
+
+DEFAULT_NUM_RANKED = 100
+
+
+class CandidateRanking(Enum):
+    Heuristic = auto(),
+    Entropy = auto(),
+    Mass = auto()
+
+    @classmethod
+    def from_string(cls, s: str) -> Self:
+        cleaned = ''.join(c for c in s.lower() if c.isalpha())
+
+        for k, valid in _INPUT_MAPPING.items():
+            if cleaned in valid:
+                return k
+
+        raise TypeError(f'{s} invalid as CandidateRanking input')
+
+
+_INPUT_MAPPING: dict[CandidateRanking, tuple[str, ...]] = {
+    CandidateRanking.Heuristic: ('heuristic', 'letters', 'letterscore'),
+    CandidateRanking.Entropy: ('entropy', 'information'),
+    CandidateRanking.Mass: ('mass', 'remainingmass', 'expectedmass')
+}
@@ -0,0 +1,157 @@
+import hashlib
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Optional, Self
+import numpy as np
+
+from wordle_solver.common.bitset_index import BitsetIndex, build_bitset_arrays
+from wordle_solver.util.constants import ALPHABET_LETTERS, ALL_WORDS_PATH, CORPUS_PATH, WORD_FREQUENCIES_PATH
+from wordle_solver.util.utils import get_files_digest, get_word_frequencies, read_all_words
+from wordle_solver.util.word_utils import convert_word
+
+DEFAULT_FREQUENCY = 100
+CORPUS_VERSION = 2
+# survivor hashes only have to agree within a run, a fixed seed also makes them agree across processes
+SURVIVOR_HASH_SEED = 0x5eed
+
+type CorpusHandle = dict[str, tuple[str, tuple[int, ...], str]]
+
+
+def _get_complete_word_frequencies(all_words: list[str]) -> dict[str, int]:
+    word_frequencies = get_word_frequencies()
+    for word in all_words:
+        if word not in word_frequencies:
+            word_frequencies[word] = DEFAULT_FREQUENCY
+
+    return word_frequencies
+
+
+def _get_score_from_frequency(freq: int) -> float:
+    return np.log10(freq)
+
+
+def _get_char_counts(words_arr: np.ndarray) -> np.ndarray:
+    # per word letter counts, every word gets its own ALPHABET_LETTERS bins
+    offsets = np.arange(len(words_arr))[:, None] * ALPHABET_LETTERS
+    counts = np.bincount((words_arr + offsets).ravel(), minlength=len(words_arr) * ALPHABET_LETTERS)
+    return counts.reshape(len(words_arr), ALPHABET_LETTERS).astype(np.uint8)
+
+
+class Corpus:
+    # immutable per word arrays shared by every WordReducer built over the same word list
+    FIELDS = ('words', 'words_arr', 'char_counts', 'frequencies', 'scores', 'pos_letter_bits', 'min_count_bits', 'exact_count_bits')
+
+    def __init__(
+            self,
+            words: np.ndarray,
+            words_arr: np.ndarray,
+            char_counts: np.ndarray,
+            frequencies: np.ndarray,
+            scores: np.ndarray,
+            pos_letter_bits: np.ndarray,
+            min_count_bits: np.ndarray,
+            exact_count_bits: np.ndarray):
+        self.words = words
+        self.words_arr = words_arr
+        self.char_counts = char_counts
+        self.frequencies = frequencies
+        self.scores = scores
+        self.pos_letter_bits = pos_letter_bits
+        self.min_count_bits = min_count_bits
+        self.exact_count_bits = exact_count_bits
+        # 128 random bits per word, a survivor set is keyed by the xor over its words
+        self.survivor_hashes = np.random.default_rng(SURVIVOR_HASH_SEED).integers(0, 2**64, (len(words), 2), dtype=np.uint64, endpoint=False)
+        self._word_idxs: Optional[dict[str, int]] = None
+
+    @classmethod
+    def from_words(cls, words: list[str]) -> Self:
+        freq_dict = _get_complete_word_frequencies(words)
+        frequencies = np.array([freq_dict[word] for word in words])
+        words_arr = np.array([convert_word(word) for word in words], dtype=np.uint8)
+        char_counts = _get_char_counts(words_arr)
+
+        return cls(
+            np.array(words, dtype='U5'),
+            words_arr,
+            char_counts,
+            frequencies,
+            np.array([_get_score_from_frequency(freq) for freq in frequencies]),
+            *build_bitset_arrays(words_arr, char_counts))
+
+    def get_word_idxs(self) -> dict[str, int]:
+        # shared by every reducer over this corpus, building it costs about as much as a filter step
+        if self._word_idxs is None:
+            self._word_idxs = {word: i for i, word in enumerate(self.words.tolist())}
+        return self._word_idxs
+
+    def get_bitset_index(self) -> BitsetIndex:
+        return BitsetIndex(len(self.words), self.pos_letter_bits, self.min_count_bits, self.exact_count_bits)
+
+    def get_prior_digest(self) -> bytes:
+        return hashlib.sha256(np.ascontiguousarray(self.frequencies, dtype='<i8').tobytes()).digest()
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def save(self, sources_digest: bytes, path: str = CORPUS_PATH):
+        tmp_path = f'{path}.tmp.npz'
+        np.savez(
+            tmp_path,
+            version=np.array(CORPUS_VERSION),
+            sources_digest=np.frombuffer(sources_digest, dtype=np.uint8),
+            **self.arrays())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, sources_digest: bytes, path: str = CORPUS_PATH) -> Optional[Self]:
+        if not os.path.isfile(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != CORPUS_VERSION or data['sources_digest'].tobytes() != sources_digest:
+                return None
+            return cls(**{field: data[field] for field in cls.FIELDS})
+
+
+def load_corpus(path: str = CORPUS_PATH) -> Corpus:
+    # the cached corpus is rebuilt whenever the word list or frequency file changes
+    sources_digest = get_files_digest([ALL_WORDS_PATH, WORD_FREQUENCIES_PATH])
+    if (corpus := Corpus.load(sources_digest, path)) is not None:
+        return corpus
+
+    corpus = Corpus.from_words(read_all_words())
+    corpus.save(sources_digest, path)
+    return corpus
+
+
+class SharedCorpus:
+    # publishes a Corpus through shared memory, only the creating process may close it
+    def __init__(self, corpus: Corpus):
+        self._blocks: list[SharedMemory] = []
+        self.handle: CorpusHandle = {}
+
+        for field, arr in corpus.arrays().items():
+            shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._blocks.append(shm)
+            self.handle[field] = (shm.name, arr.shape, arr.dtype.str)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+def attach_corpus(handle: CorpusHandle) -> tuple[Corpus, list[SharedMemory]]:
+    # the returned blocks back the corpus arrays and have to outlive them
+    blocks = []
+    arrays = {}
+    for field, (name, shape, dtype) in handle.items():
+        shm = SharedMemory(name=name)
+        blocks.append(shm)
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.flags.writeable = False
+        arrays[field] = arr
+
+    return Corpus(**arrays), blocks
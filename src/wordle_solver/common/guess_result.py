@@ -2,11 +2,16 @@ from collections import Counter, defaultdict
 import numpy as np
 
 from wordle_solver.common.single_result import SingleResult
-from wordle_solver.common.word_reducer_constants import GUARANTEED, YELLOW
+from wordle_solver.common.word_reducer_constants import GUARANTEED, PATTERN_BASE, PATTERN_DIGS, YELLOW
 from wordle_solver.util.constants import WORD_LENGTH
 
 type GuessResult = list[SingleResult]
 
+# bounds the (guesses x answers x WORD_LENGTH) temporaries of get_pattern_ids
+BATCH_CELLS = 1 << 20
+# EARLIER_POSITIONS[i, j] is whether position i comes before position j
+EARLIER_POSITIONS = np.triu(np.ones((WORD_LENGTH, WORD_LENGTH), dtype=np.bool), 1)
+
 
 def get_guess_result(guess: str, ans: str) -> GuessResult:
     char_counts = Counter(ans)
@@ -60,3 +65,69 @@ def to_res_arr(guess: str, res: GuessResult) -> np.ndarray:
             ret[i] = YELLOW
 
     return ret
+
+
+def to_pattern_id(res: GuessResult) -> int:
+    return sum(int(r) * int(dig) for r, dig in zip(res, PATTERN_DIGS))
+
+
+def from_pattern_id(pattern_id: int) -> GuessResult:
+    return [SingleResult(int(pattern_id) // int(dig) % PATTERN_BASE) for dig in PATTERN_DIGS]
+
+
+def get_pattern_ids(guesses_arr: np.ndarray, answers_arr: np.ndarray) -> np.ndarray:
+    # batched get_guess_result over convert_word rows, returns a (guesses x answers) matrix of pattern ids
+    guesses_arr = np.atleast_2d(np.asarray(guesses_arr, dtype=np.uint8))
+    answers_arr = np.atleast_2d(np.asarray(answers_arr, dtype=np.uint8))
+    ret = np.empty((guesses_arr.shape[0], answers_arr.shape[0]), dtype=np.uint8)
+
+    chunk = max(1, BATCH_CELLS // max(1, answers_arr.shape[0]))
+    for start in range(0, guesses_arr.shape[0], chunk):
+        ret[start:start + chunk] = _get_pattern_ids_chunk(guesses_arr[start:start + chunk], answers_arr)
+
+    return ret
+
+
+def _get_pattern_ids_chunk(guesses_arr: np.ndarray, answers_arr: np.ndarray) -> np.ndarray:
+    guesses = guesses_arr[:, None, :]
+    answers = answers_arr[None, :, :]
+    greens = guesses == answers
+    not_greens = ~greens
+    trits = greens * np.uint8(SingleResult.GREEN)
+
+    # a non-green letter is yellow while the answer has more unmatched copies than earlier non-green guesses used up
+    for j in range(WORD_LENGTH):
+        c = guesses[:, :, j:j + 1]
+        available = np.sum((answers == c) & not_greens, axis=2)
+        prior = np.sum(not_greens[:, :, :j] & (guesses[:, :, :j] == c), axis=2)
+        trits[:, :, j] += (not_greens[:, :, j] & (available > prior)) * np.uint8(SingleResult.YELLOW)
+
+    return trits @ PATTERN_DIGS
+
+
+def get_guess_pattern_ids(guess_arr: np.ndarray, answers_arr: np.ndarray, char_counts: np.ndarray) -> np.ndarray:
+    # single guess get_pattern_ids against answers with their precomputed letter counts
+    same_char = guess_arr[:, None] == guess_arr[None, :]
+    greens = answers_arr == guess_arr
+    not_greens = ~greens
+
+    unmatched = char_counts[:, guess_arr] - greens.astype(np.uint8) @ same_char.astype(np.uint8)
+    prior = not_greens.astype(np.uint8) @ (same_char & EARLIER_POSITIONS).astype(np.uint8)
+    trits = greens * np.uint8(SingleResult.GREEN) + (not_greens & (unmatched > prior)) * np.uint8(SingleResult.YELLOW)
+
+    return trits @ PATTERN_DIGS
+
+
+def patterns_to_res_arrs(guess_arr: np.ndarray, pattern_ids: np.ndarray) -> np.ndarray:
+    # vectorized to_res_arr for many patterns of the same guess
+    trits = (np.asarray(pattern_ids, dtype=np.int64)[:, None] // PATTERN_DIGS) % PATTERN_BASE
+    same_char = (guess_arr[:, None] == guess_arr[None, :]).astype(np.uint8)
+
+    known = (trits > SingleResult.GRAY).astype(np.uint8) @ same_char
+    has_gray = ((trits == SingleResult.GRAY).astype(np.uint8) @ same_char) > 0
+
+    ret = np.where(trits == SingleResult.YELLOW, YELLOW, 0)
+    ret = np.where(has_gray & (known > 0), known, ret)
+    ret = np.where(trits == SingleResult.GREEN, GUARANTEED, ret)
+
+    return ret.astype(np.uint8)
@@ -0,0 +1,58 @@
+import os
+from typing import Optional
+import numpy as np
+from tqdm import tqdm
+
+from wordle_solver.common.guess_result import get_pattern_ids
+from wordle_solver.util.constants import PATTERN_MATRIX_PATH
+from wordle_solver.util.utils import get_words_digest
+from wordle_solver.util.word_utils import convert_word
+
+# file layout: magic, word count, sha256 of the word list, then the N x N uint8 pattern ids
+MAGIC = b'WRDLPM01'
+_COUNT_DTYPE = np.dtype('<u8')
+_DIGEST_SIZE = 32
+HEADER_SIZE = len(MAGIC) + _COUNT_DTYPE.itemsize + _DIGEST_SIZE
+BUILD_ROWS = 64
+
+# stale files already reported by this process, forked workers inherit it and stay quiet too
+_WARNED_PATHS: set[str] = set()
+
+
+def build_pattern_matrix(words: list[str], path: str = PATTERN_MATRIX_PATH, progress_bar: bool = True):
+    words_arr = np.array([convert_word(word) for word in words], dtype=np.uint8)
+    num_words = len(words)
+    tmp_path = f'{path}.tmp'
+
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.array(num_words, dtype=_COUNT_DTYPE).tobytes())
+        f.write(get_words_digest(words))
+
+    mat = np.memmap(tmp_path, dtype=np.uint8, mode='r+', offset=HEADER_SIZE, shape=(num_words, num_words))
+    starts = range(0, num_words, BUILD_ROWS)
+    for start in (tqdm(starts) if progress_bar else starts):
+        mat[start:start + BUILD_ROWS] = get_pattern_ids(words_arr[start:start + BUILD_ROWS], words_arr)
+    mat.flush()
+    del mat
+
+    os.replace(tmp_path, path)
+
+
+def load_pattern_matrix(words: list[str], path: str = PATTERN_MATRIX_PATH, warn: bool = True) -> Optional[np.ndarray]:
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        return None
+    num_words = int(np.frombuffer(header, dtype=_COUNT_DTYPE, count=1, offset=len(MAGIC))[0])
+    if num_words != len(words) or header[-_DIGEST_SIZE:] != get_words_digest(words):
+        if warn and path not in _WARNED_PATHS:
+            _WARNED_PATHS.add(path)
+            print(f'{path} was built for a different word list, ignoring it...')
+        return None
+
+    return np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(num_words, num_words))
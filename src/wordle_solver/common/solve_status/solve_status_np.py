@@ -1,5 +1,4 @@
 import numpy as np
-from typing import Any
 
 from wordle_solver.common.word_reducer_constants import GUARANTEED, YELLOW
 from wordle_solver.util.constants import WORD_LENGTH, ALPHABET_LETTERS
@@ -23,9 +22,6 @@ class SolveStatusNp:
     def get_capped(self) -> np.ndarray:
         return self._capped_stack[-1]
     
-    def key(self) -> Any:
-        return np.concatenate((np.packbits(self._valids_stack[-1]), self._lowers_stack[-1], self._capped_stack[-1])).tobytes()
-
     def update(self, guess_arr: np.ndarray, res_arr: np.ndarray):
         valids, lowers, capped = self._add_word(guess_arr, res_arr)
         self._valids_stack = [valids]
@@ -55,7 +51,7 @@ class SolveStatusNp:
         valids[res_arr == GUARANTEED, guess_arr[res_arr == GUARANTEED]] = True
 
         capped_idxs = (res_arr > 0) & (res_arr < YELLOW)
-        lowers = np.maximum(lowers, np.bincount(guess_arr[res_arr == YELLOW], minlength=ALPHABET_LETTERS))
+        lowers = np.maximum(lowers, np.bincount(guess_arr[(res_arr == YELLOW) | (res_arr == GUARANTEED)], minlength=ALPHABET_LETTERS))
         capped[guess_arr[capped_idxs]] = res_arr[capped_idxs]
 
         return valids, lowers, capped
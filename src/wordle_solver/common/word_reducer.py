@@ -1,207 +1,258 @@
-from functools import reduce
 import numpy as np
 from decimal import Decimal
+from typing import Iterable, Optional
 
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import BATCH_CELLS, get_guess_pattern_ids, get_pattern_ids
 from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
-from wordle_solver.common.word_reducer_constants import DIG_CAP, GUARANTEED, YELLOW
-from wordle_solver.util.constants import WORD_LENGTH, ALPHABET_LETTERS
-from wordle_solver.util.word_utils import convert_word, convert_word_sparse
-from wordle_solver.util.utils import get_word_frequencies
+from wordle_solver.common.word_reducer_constants import NUM_PATTERNS
+from wordle_solver.util.constants import ALPHABET_LETTERS, WORD_LENGTH
 
-ALPHABET_IDXS = np.arange(ALPHABET_LETTERS, dtype=np.uint8)
-RES_DIGS = np.array([np.power(DIG_CAP, i) for i in range(WORD_LENGTH)])
-RES_MODS = np.array([np.power(DIG_CAP, i + 1) for i in range(WORD_LENGTH)])
-ORDERED_ARRS = np.array([(i % RES_MODS) // RES_DIGS for i in range(np.power(DIG_CAP, WORD_LENGTH))])
-
-NE_BOUND = ALPHABET_LETTERS // 2
-
-DEFAULT_FREQUENCY = 100
-
-
-def _get_single_arr_valid(i: int, arr: np.ndarray, mat: np.ndarray) -> np.ndarray:
-    if np.sum(arr) >= NE_BOUND:
-        return reduce(np.logical_and, (mat[:, i] != v for v in ALPHABET_IDXS[~arr]))
-    else:
-        return reduce(np.logical_or, (mat[:, i] == v for v in ALPHABET_IDXS[arr]))
-
-
-def _get_complete_word_frequencies(all_words: list[str]) -> dict[str, int]:
-    word_frequencies = get_word_frequencies()
-    for word in all_words:
-        if word not in word_frequencies:
-            word_frequencies[word] = DEFAULT_FREQUENCY
-
-    return word_frequencies
-
-
-def _get_score_from_frequency(freq: int) -> float:
-    return np.log10(freq)
-
-
-def _multiply_along_axis(A: np.ndarray, B: np.ndarray, axis: int) -> np.ndarray:
-    return np.swapaxes(np.swapaxes(A, axis, -1) * B, -1, axis)
-
-
-def _divide_along_axis(A: np.ndarray, B: np.ndarray, axis: int) -> np.ndarray:
-    return np.swapaxes(np.swapaxes(A, axis, -1) / B, -1, axis)
+NUM_LIKELY_CANDIDATES = 10
+# offsets turning a words_arr row into its flat position x letter ids
+POS_LETTER_OFFSETS = np.arange(WORD_LENGTH) * ALPHABET_LETTERS
 
 
 class WordReducer:
-    def __init__(self, words: list[str], solve_status: SolveStatusNp):
-        freq_dict = _get_complete_word_frequencies(words)
-        self._idxs = {word: i for i, word in enumerate(words)}
+    def __init__(
+            self,
+            words: list[str],
+            solve_status: SolveStatusNp,
+            pattern_matrix: Optional[np.ndarray] = None,
+            corpus: Optional[Corpus] = None,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED):
+        if corpus is None:
+            corpus = Corpus.from_words(words)
+
+        self._idxs = corpus.get_word_idxs()
         self._ss = solve_status
+        self._corpus = corpus
+        self._all_words = corpus.words
+        self._full_words_arr = corpus.words_arr
+        # the search stack only holds surviving indexes, per node views of the corpus are gathered when first asked for
         self._valid_idxs = [np.arange(len(words))]
-        self._valid_stack = [np.ones(len(words), dtype=np.bool)]
-        self._frequencies_stack = [np.array([freq_dict[word] for word in words])]
-        self._ans_scores_stack = [np.array([_get_score_from_frequency(freq) for freq in self._frequencies_stack[0]])]
-        self._all_words = np.array(words, dtype='U5')
-        self._words_stack = [self._all_words]
-        self._full_words_arr = np.array([convert_word(word) for word in words], dtype=np.uint8)
-        self._words_arr_stack: list[np.ndarray] = [self._full_words_arr]
-        self._full_sparse_words = np.array([convert_word_sparse(word) for word in words], dtype=np.bool)
-        self._sparse_words_stack = [self._full_sparse_words]
-        self._full_char_counts = np.sum(self._sparse_words_stack[0], axis=1, dtype=np.uint8)
-        self._char_counts_stack: list[np.ndarray] = [self._full_char_counts]
+        self._views_stack: list[dict[str, np.ndarray]] = [{}]
+        self._pattern_matrix = pattern_matrix
+        self._candidate_ranking = candidate_ranking
+        self._num_ranked = num_ranked
+        self._bitset_index = corpus.get_bitset_index()
 
     def is_valid(self, i: int) -> bool:
-        return self._valid_stack[-1][i]
+        idxs = self._valid_idxs[-1]
+        pos = np.searchsorted(idxs, i)
+        return pos < len(idxs) and idxs[pos] == i
 
     def get_guess_arr(self, word: str) -> np.ndarray:
         return self._full_words_arr[self._idxs[word]]
 
     def num_answers(self) -> int:
-        return self._words_stack[-1].shape[0]
+        return len(self._valid_idxs[-1])
     
     def get_arbitrary_word(self) -> str:
-        return self._words_stack[-1][0]
-
-    def get_guess_distr_and_counts(self, i: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        guess_arr, ret = self._get_guess_distr(i)
+        return self._all_words[self._valid_idxs[-1][0]]
+
+    def get_guess_distr_and_counts(self, i: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # the pattern ids the guess splits the survivors into with their score mass, patterns_to_res_arrs gives their constraints
+        guess_arr, patterns = self._get_guess_patterns(i)
+        cnts = np.bincount(patterns, minlength=NUM_PATTERNS, weights=self._view('scores'))
+        nonzero = np.flatnonzero(cnts)
+        return guess_arr, nonzero.astype(np.uint8), cnts[nonzero]
+
+    def get_guess_buckets(self, i: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        guess_arr, keys, bucket_idxs = self._get_guess_bucket_idxs(i)
+        num_buckets = len(keys)
+        frequencies = self._view('frequencies')
+        scores = self._view('scores')
+
+        weights = np.bincount(bucket_idxs, weights=scores, minlength=num_buckets)
+        top_weights = np.zeros(num_buckets, dtype=np.float64)
+        np.maximum.at(top_weights, bucket_idxs, scores)
+        sizes = np.bincount(bucket_idxs, minlength=num_buckets)
+        total_freqs = np.bincount(bucket_idxs, weights=frequencies, minlength=num_buckets)
+        top_freqs = np.zeros(num_buckets, dtype=np.float64)
+        np.maximum.at(top_freqs, bucket_idxs, frequencies)
+
+        return guess_arr, keys, weights, top_weights, sizes, top_freqs, total_freqs, bucket_idxs
+
+    def get_bucket_survivors(self, bucket_idxs: np.ndarray, sizes: np.ndarray) -> list[np.ndarray]:
+        # the surviving indexes of every bucket, each still sorted
+        order = np.argsort(bucket_idxs, kind='stable')
+        return np.split(self._valid_idxs[-1][order], np.cumsum(sizes)[:-1])
+
+    def _get_guess_bucket_idxs(self, i: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # bucket keys are the sorted pattern ids present, every survivor gets the position of its pattern among them
+        guess_arr, patterns = self._get_guess_patterns(i)
+        present = np.zeros(NUM_PATTERNS, dtype=np.bool)
+        present[patterns] = True
+        keys = np.flatnonzero(present)
+        return guess_arr, keys.astype(np.uint8), np.searchsorted(keys, patterns)
+
+    def _get_guess_patterns(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        guess_arr = self._full_words_arr[i]
+        if self._pattern_matrix is not None:
+            return guess_arr, self._pattern_matrix[i][self._valid_idxs[-1]]
+        return guess_arr, get_guess_pattern_ids(guess_arr, self._view('words_arr'), self._view('char_counts'))
 
-        cnts = np.bincount(np.sum(ret * RES_DIGS, axis=1, dtype=np.uint16), minlength=len(ORDERED_ARRS), weights=self._ans_scores_stack[-1])
-        nonzero = cnts != 0
-        return guess_arr, ORDERED_ARRS[nonzero], cnts[nonzero]
-    
-    def get_top_freq(self) -> tuple[Decimal, str]:
-        frequencies = self._frequencies_stack[-1]
+    def get_top_freq(self, exact: bool = False) -> tuple[float | Decimal, str]:
+        frequencies = self._view('frequencies')
         tot = np.sum(frequencies)
         highest_idx = np.argmax(frequencies)
         highest = frequencies[highest_idx]
 
-        return Decimal(highest.item()) / Decimal(tot.item()), self._words_stack[-1][highest_idx]
+        if exact:
+            return Decimal(highest.item()) / Decimal(tot.item()), self._all_words[self._valid_idxs[-1][highest_idx]]
+        return highest.item() / tot.item(), self._all_words[self._valid_idxs[-1][highest_idx]]
 
     def get_top_candidates(self) -> list[int]:
+        if self._candidate_ranking == CandidateRanking.Heuristic:
+            return self._get_heuristic_candidates()
+        return self.get_ranked_candidates(self._candidate_ranking, self._num_ranked)
+
+    def get_ranked_candidates(self, candidate_ranking: CandidateRanking, num_ranked: int) -> list[int]:
+        # the num_ranked best guesses by the batched ranking, best first, followed by any of the likeliest answers they miss
+        if candidate_ranking == CandidateRanking.Entropy:
+            ranks = self.get_guess_entropies()
+        else:
+            ranks = -self.get_guess_remaining_masses()
+
+        num_ranked = min(num_ranked, len(ranks))
+        top = np.argpartition(-ranks, num_ranked - 1)[:num_ranked]
+        ret = top[np.lexsort((top, -ranks[top]))].tolist()
+
+        ranked = set(ret)
+        likely_candidates = self._valid_idxs[-1][self._get_top_from_1d(self._view('frequencies'), NUM_LIKELY_CANDIDATES)]
+        ret.extend(i for i in likely_candidates.tolist() if i not in ranked)
+        return ret
+
+    def get_guess_entropies(self) -> np.ndarray:
+        # score weighted entropy of the feedback partition every guess makes of the surviving answers
+        scores = self._view('scores')
+        ret = np.empty(len(self._all_words))
+
+        for start, stop, flat in self._iter_guess_partitions():
+            rows = stop - start
+            distr = np.bincount(flat, weights=np.tile(scores, rows), minlength=rows * NUM_PATTERNS).reshape(rows, NUM_PATTERNS)
+            totals = np.sum(distr, axis=1, keepdims=True)
+            distr = np.divide(distr, totals, out=np.zeros_like(distr), where=totals > 0)
+            logs = np.log2(distr, out=np.zeros_like(distr), where=distr > 0)
+            ret[start:stop] = -np.sum(distr * logs, axis=1)
+
+        return ret
+
+    def get_guess_remaining_masses(self, guesses: Optional[np.ndarray] = None) -> np.ndarray:
+        # score mass every guess leaves unsolved after the likeliest follow up in each of its buckets, the depth one leaf cost
+        scores = self._view('scores')
+        frequencies = self._view('frequencies').astype(np.float64)
+        ret = np.empty(len(self._all_words) if guesses is None else len(guesses))
+
+        for start, stop, flat in self._iter_guess_partitions(guesses):
+            rows = stop - start
+            weights = np.bincount(flat, weights=np.tile(scores, rows), minlength=rows * NUM_PATTERNS)
+            total_freqs = np.bincount(flat, weights=np.tile(frequencies, rows), minlength=rows * NUM_PATTERNS)
+            top_freqs = np.zeros(rows * NUM_PATTERNS)
+            np.maximum.at(top_freqs, flat, np.tile(frequencies, rows))
+
+            top_shares = np.divide(top_freqs, total_freqs, out=np.ones_like(top_freqs), where=total_freqs > 0)
+            ret[start:stop] = np.sum((weights * (1.0 - top_shares)).reshape(rows, NUM_PATTERNS), axis=1)
+
+        return ret
+
+    def _iter_guess_partitions(self, guesses: Optional[np.ndarray] = None) -> Iterable[tuple[int, int, np.ndarray]]:
+        # pattern ids of every guess (or of guesses) against the surviving answers, offset so each guess gets its own NUM_PATTERNS bins
+        answers = self._valid_idxs[-1]
+        num_guesses = len(self._all_words) if guesses is None else len(guesses)
+        chunk = max(1, BATCH_CELLS // len(answers))
+
+        for start in range(0, num_guesses, chunk):
+            stop = min(start + chunk, num_guesses)
+            rows = slice(start, stop) if guesses is None else guesses[start:stop]
+            if self._pattern_matrix is not None:
+                patterns = self._pattern_matrix[rows][:, answers]
+            else:
+                patterns = get_pattern_ids(self._full_words_arr[rows], self._view('words_arr'))
+
+            yield start, stop, (patterns + (np.arange(stop - start) * NUM_PATTERNS)[:, None]).ravel()
+
+    def _get_heuristic_candidates(self) -> list[int]:
         char_scores = self._get_char_scores()
-        full_candidates = self._get_top_scores_mat(self._full_sparse_words, char_scores, 85)
-        curr_idxs = self._get_top_scores_mat(self._sparse_words_stack[-1], char_scores, 5)
+        full_candidates = self._get_top_scores_mat(self._full_words_arr, char_scores, 85)
+        curr_idxs = self._get_top_scores_mat(self._view('words_arr'), char_scores, 5)
         curr_candidates = self._valid_idxs[-1][curr_idxs]
 
         # most likely answers
-        likely_candidates = self._valid_idxs[-1][self._get_top_from_1d(self._frequencies_stack[-1], 10)]
+        likely_candidates = self._valid_idxs[-1][self._get_top_from_1d(self._view('frequencies'), NUM_LIKELY_CANDIDATES)]
 
         ret = set()
         ret.update(full_candidates)
         ret.update(curr_candidates)
         ret.update(likely_candidates)
 
-        print(self._all_words[full_candidates])
-        print(self._all_words[curr_candidates])
-        print(self._all_words[likely_candidates])
-
         return list(ret)
         # return list(range(len(self._all_words)))
 
     def try_update(self):
-        idxs = self._get_word_idxs()
+        idxs = self._valid_idxs[-1]
+        self._valid_idxs.append(idxs[self._get_word_idxs()])
+        self._views_stack.append({})
 
-        invalid_idxs = self._valid_idxs[-1][~idxs]
-        new_valids = self._valid_stack[-1].copy()
-        new_valids[invalid_idxs] = False
-        self._valid_stack.append(new_valids)
+    def push(self, idxs: np.ndarray):
+        # moves to a survivor set that is already known, such as one bucket of a guess
+        self._valid_idxs.append(idxs)
+        self._views_stack.append({})
 
-        self._valid_idxs.append(self._valid_idxs[-1][idxs])
-        self._frequencies_stack.append(self._frequencies_stack[-1][idxs])
-        self._ans_scores_stack.append(self._ans_scores_stack[-1][idxs])
-        self._words_stack.append(self._words_stack[-1][idxs])
-        self._words_arr_stack.append(self._words_arr_stack[-1][idxs])
-        self._sparse_words_stack.append(self._sparse_words_stack[-1][idxs])
-        self._char_counts_stack.append(self._char_counts_stack[-1][idxs])
+    def get_survivors(self) -> np.ndarray:
+        return self._valid_idxs[-1]
+
+    def get_survivor_key(self) -> bytes:
+        # equal survivor sets get equal keys whichever guesses led to them
+        views = self._views_stack[-1]
+        if 'survivor_key' not in views:
+            views['survivor_key'] = np.bitwise_xor.reduce(self._view('survivor_hashes'), axis=0).tobytes()
+        return views['survivor_key']
 
     def update(self):
         self.try_update()
         
-        self._valid_stack = [self._valid_stack[-1]]
         self._valid_idxs = [self._valid_idxs[-1]]
-        self._frequencies_stack = [self._frequencies_stack[-1]]
-        self._ans_scores_stack = [self._ans_scores_stack[-1]]
-        self._words_stack = [self._words_stack[-1]]
-        self._words_arr_stack = [self._words_arr_stack[-1]]
-        self._sparse_words_stack = [self._sparse_words_stack[-1]]
-        self._char_counts_stack = [self._char_counts_stack[-1]]
+        self._views_stack = [self._views_stack[-1]]
 
     def undo(self):
-        self._valid_stack.pop()
         self._valid_idxs.pop()
-        self._frequencies_stack.pop()
-        self._ans_scores_stack.pop()
-        self._words_stack.pop()
-        self._words_arr_stack.pop()
-        self._sparse_words_stack.pop()
-        self._char_counts_stack.pop()
+        self._views_stack.pop()
+
+    def _view(self, name: str) -> np.ndarray:
+        views = self._views_stack[-1]
+        if name not in views:
+            views[name] = getattr(self._corpus, name)[self._valid_idxs[-1]]
+        return views[name]
 
     def _get_top_from_1d(self, arr: np.ndarray, num_top: int) -> np.ndarray:
         if len(arr) <= num_top:
             return np.arange(len(arr))
         return np.argpartition(-arr, num_top)[:num_top]
 
-    def _get_top_scores_mat(self, mat: np.ndarray, char_scores: np.ndarray, num_top) -> np.ndarray:
-        if num_top >= mat.shape[0]:
-            return np.arange(mat.shape[0])
-        score_mat = self._get_scored_mat(mat, char_scores)
+    def _get_top_scores_mat(self, words_arr: np.ndarray, char_scores: np.ndarray, num_top) -> np.ndarray:
+        if num_top >= words_arr.shape[0]:
+            return np.arange(words_arr.shape[0])
+        score_mat = self._get_scored_mat(words_arr, char_scores)
         return np.argpartition(-score_mat, num_top)[:num_top]
 
-    def _get_scored_mat(self, mat: np.ndarray, char_scores: np.ndarray) -> np.ndarray:
-        return np.sum(mat * char_scores, axis=(1, 2))
+    def _get_scored_mat(self, words_arr: np.ndarray, char_scores: np.ndarray) -> np.ndarray:
+        return np.sum(char_scores.ravel()[words_arr + POS_LETTER_OFFSETS], axis=1)
         
     def _get_char_scores(self) -> np.ndarray:
-        total_counts = np.sum(self._sparse_words_stack[-1], axis=0)
-        inverted = len(self._sparse_words_stack[-1]) - total_counts
+        # (WORD_LENGTH x ALPHABET_LETTERS) counts and score mass of the survivors, binned by position x letter id
+        pos_letters = (self._view('words_arr') + POS_LETTER_OFFSETS).ravel()
+        num_bins = WORD_LENGTH * ALPHABET_LETTERS
+        total_counts = np.bincount(pos_letters, minlength=num_bins).reshape(WORD_LENGTH, ALPHABET_LETTERS)
+        inverted = self.num_answers() - total_counts
 
-
-        raw = np.sum(_multiply_along_axis(self._sparse_words_stack[-1], self._ans_scores_stack[-1], 0), axis=0)
-        probs = _divide_along_axis(raw, np.sum(raw, axis=1), 0)
+        raw = np.bincount(pos_letters, weights=np.repeat(self._view('scores'), WORD_LENGTH), minlength=num_bins).reshape(WORD_LENGTH, ALPHABET_LETTERS)
+        probs = raw / np.sum(raw, axis=1, keepdims=True)
 
         return probs * total_counts + inverted * (1 - probs)
     
     def _get_word_idxs(self) -> np.ndarray:
-        reduced_idxs = (self._get_lowers_check()) & (self._get_capped_check())
-        nested_reduction = self._get_valid_check(reduced_idxs)
-        reduced_idxs[np.where(reduced_idxs)[0][~nested_reduction]] = False
-
-        return reduced_idxs
-    
-    def _get_valid_check(self, reduced_idxs: np.ndarray) -> np.ndarray:
-        valids = self._ss.get_valids()
-        
-        mat = self._words_arr_stack[-1][reduced_idxs]
-        return reduce(np.logical_and, (_get_single_arr_valid(i, arr, mat) for i, arr in enumerate(valids)))
-    
-    def _get_lowers_check(self) -> np.ndarray:
-        lowers = self._ss.get_lowers()
-        return np.all(self._char_counts_stack[-1] >= lowers, axis=1)
-    
-    def _get_capped_check(self) -> np.ndarray:
-        capped = self._ss.get_capped()
-        capped_idxs = capped > 0
-        return np.all(self._char_counts_stack[-1][:, capped_idxs] == capped[capped_idxs], axis=1)
-    
-    def _get_guess_distr(self, i: int) -> tuple[np.ndarray, np.ndarray]:
-        guess_arr = self._full_words_arr[i]
-        guess_counts = self._full_char_counts[i][guess_arr]
-        matching = self._words_arr_stack[-1] == guess_arr
-        char_counts_guess = self._char_counts_stack[-1][:, guess_arr]
-        
-        distr = matching * GUARANTEED + ((~matching) & (char_counts_guess > 0) & (char_counts_guess >= guess_counts)) * YELLOW + ((~matching) & (char_counts_guess > 0) & (char_counts_guess < guess_counts)) * char_counts_guess
-
-        return guess_arr, distr
+        return self._bitset_index.get_survivor_mask(self._ss)[self._valid_idxs[-1]]
@@ -7,4 +7,7 @@ DIG_CAP = WORD_LENGTH + 2
 GUARANTEED = DIG_CAP - 1
 YELLOW = GUARANTEED - 1
 
-SOLVED = np.array([GUARANTEED] * WORD_LENGTH)
+PATTERN_BASE = 3
+NUM_PATTERNS = PATTERN_BASE ** WORD_LENGTH
+PATTERN_DIGS = np.array([PATTERN_BASE ** i for i in range(WORD_LENGTH)], dtype=np.uint8)
+SOLVED_PATTERN = NUM_PATTERNS - 1
@@ -3,23 +3,49 @@ import os
 
 from wordle_solver.analyzer.candidate_guess.candidate_guesser_factory import CandidateGuesserFactory
 from wordle_solver.analyzer.candidate_guess.guesser_type import GuesserType
-from wordle_solver.executor.executor import Executor
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.executor.executor import DEFAULT_MAX_SEARCH_DEPTH, Executor
+from wordle_solver.executor.parallelism import Parallelism
+from wordle_solver.util.constants import GUESS_STORE_PATH
+from wordle_solver.util.profiler import report_stats
 
 parser = argparse.ArgumentParser()
 parser.add_argument('-g', '--candidate_guessing_strategy', type=GuesserType.from_string, default=GuesserType.NoGuess)
 parser.add_argument('--num_common_chars', type=int, default=2)
 parser.add_argument('--num_candidate_guesses', type=int, default=100)
 parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+parser.add_argument('--cache_budget_mb', type=int, default=64)
+parser.add_argument('-d', '--max_search_depth', type=int, default=DEFAULT_MAX_SEARCH_DEPTH)
+parser.add_argument('-p', '--parallelism', type=Parallelism.from_string, default=Parallelism.Auto)
+parser.add_argument('-r', '--candidate_ranking', type=CandidateRanking.from_string, default=CandidateRanking.Heuristic)
+parser.add_argument('-k', '--num_ranked', type=int, default=DEFAULT_NUM_RANKED)
+parser.add_argument('--guess_store', default=GUESS_STORE_PATH, help='sqlite file best guesses are shared through across runs')
+parser.add_argument('--no_guess_store', default=False, action='store_true')
+parser.add_argument('--profile', default=False, action='store_true')
+parser.add_argument('--profile_output', default=None)
 
 
 def main():
     args = parser.parse_args()
+    profile = args.profile or args.profile_output is not None
+    guess_store_path = None if args.no_guess_store else args.guess_store
 
     candidate_guesser_factory = CandidateGuesserFactory(args.candidate_guessing_strategy, args.num_common_chars, args.num_candidate_guesses)
     candidate_guesser_builder = candidate_guesser_factory.build()
-    executor = Executor(candidate_guesser_builder, args.num_processes)
+    executor = Executor(
+        candidate_guesser_builder,
+        args.num_processes,
+        args.cache_budget_mb * 1024 * 1024,
+        args.parallelism,
+        candidate_ranking=args.candidate_ranking,
+        num_ranked=args.num_ranked,
+        profile=profile,
+        guess_store_path=guess_store_path,
+        max_search_depth=args.max_search_depth)
 
     executor.execute()
+    if profile:
+        report_stats(executor.profile_stats(), args.profile_output)
 
 
 if __name__ == '__main__':
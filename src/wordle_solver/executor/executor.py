@@ -1,35 +1,128 @@
+from multiprocessing import Pool
 from tqdm import tqdm
 from typing import Callable, Optional
 import traceback
 
 from wordle_solver.analyzer.analyzer import Analyzer
 from wordle_solver.analyzer.candidate_guess.candidate_guesser import CandidateGuesser
-from wordle_solver.common.guess_result import get_guess_result
+from wordle_solver.analyzer.guess_store import GuessStore, get_strategy
+from wordle_solver.analyzer.scorer.scorer_child import History
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus, CorpusHandle, SharedCorpus, attach_corpus, load_corpus
+from wordle_solver.common.guess_result import GuessResult, from_pattern_id, get_guess_result, to_pattern_id
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
 from wordle_solver.common.single_result import SingleResult
+from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.executor.parallelism import Parallelism
 from wordle_solver.util.constants import NUMBER_OF_GUESSES
-from wordle_solver.util.utils import read_all_words, get_best_starting_word, get_previous_answers
+from wordle_solver.util.profiler import ProfileStats, merge_stats
+from wordle_solver.util.utils import get_best_starting_word, get_previous_answers
+
+DEFAULT_MAX_SEARCH_DEPTH = 1
+# candidate level parallelism only pays for its dispatch once every process gets this many candidates per guess
+MIN_CANDIDATES_PER_PROCESS = 8
+# answers are handed out in chunks this many times smaller than an even split, to keep workers balanced
+CHUNKS_PER_PROCESS = 4
+
+type GuessCache = dict[History, str]
+
+_WORKER_EXECUTOR = None
+_WORKER_CORPUS_BLOCKS = None
+
+
+def _init_answer_worker(
+        candidate_guesser_builder: Callable[[], CandidateGuesser],
+        cache_budget_bytes: int,
+        corpus_handle: CorpusHandle,
+        candidate_ranking: CandidateRanking,
+        num_ranked: int,
+        profile: bool,
+        guess_store_path: Optional[str],
+        max_search_depth: int):
+    global _WORKER_EXECUTOR, _WORKER_CORPUS_BLOCKS
+    corpus, _WORKER_CORPUS_BLOCKS = attach_corpus(corpus_handle)
+    _WORKER_EXECUTOR = Executor(
+        candidate_guesser_builder,
+        1,
+        cache_budget_bytes,
+        Parallelism.Candidate,
+        in_process=True,
+        corpus=corpus,
+        candidate_ranking=candidate_ranking,
+        num_ranked=num_ranked,
+        profile=profile,
+        guess_store_path=guess_store_path,
+        max_search_depth=max_search_depth)
+
+
+def _solve_answers(answers: list[str]) -> tuple[list[tuple[str, Optional[int]]], GuessCache, Optional[ProfileStats]]:
+    # profile stats are cumulative for the worker, the parent keeps the latest per worker
+    results, cache = _WORKER_EXECUTOR.solve_answers(answers)
+    return results, cache, _WORKER_EXECUTOR.profile_stats() if _WORKER_EXECUTOR.profile else None
 
 
 class Executor:
-    def __init__(self, candidate_guesser_builder: Callable[[], CandidateGuesser], num_processes: int):
-        self._all_words = read_all_words()
+    def __init__(
+            self,
+            candidate_guesser_builder: Callable[[], CandidateGuesser],
+            num_processes: int,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            parallelism: Parallelism = Parallelism.Auto,
+            in_process: bool = False,
+            corpus: Optional[Corpus] = None,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED,
+            profile: bool = False,
+            guess_store_path: Optional[str] = None,
+            max_search_depth: int = DEFAULT_MAX_SEARCH_DEPTH):
+        self._corpus = load_corpus() if corpus is None else corpus
+        self._all_words = self._corpus.words.tolist()
+        self._word_idxs = {word: i for i, word in enumerate(self._all_words)}
+        self._pattern_matrix = load_pattern_matrix(self._all_words)
         self._starting_word = get_best_starting_word()
         self._previous_answers = get_previous_answers()
         self._candidate_guesser_builder = candidate_guesser_builder
-        self._analyzer = Analyzer(self._candidate_guesser_builder, self._all_words, self._starting_word, num_processes, max_search_depth=1, progress_bar=False)
+        self._num_processes = num_processes
+        self._cache_budget_bytes = cache_budget_bytes
+        self._parallelism = parallelism
+        self._in_process = in_process
+        self._candidate_ranking = candidate_ranking
+        self._num_ranked = num_ranked
+        self._profile = profile
+        self._max_search_depth = max_search_depth
+        self._worker_stats: dict[int, ProfileStats] = {}
+        self._guess_store_path = guess_store_path
+        self._guess_store = None
+        self._cache: GuessCache = {}
+        if guess_store_path is not None:
+            self._guess_store = GuessStore(self._all_words, self._corpus, max_search_depth, get_strategy(candidate_ranking, num_ranked, False, self._starting_word), guess_store_path)
+            self._cache = self._guess_store.load()
+        # entries past this point were searched in this run and still have to be stored
+        self._num_stored = len(self._cache)
+        self._analyzer = None
 
-    def execute(self):
-        cache = {}
+    @property
+    def profile(self) -> bool:
+        return self._profile
 
-        solved_guesses_taken = []
-        failed = []
+    def execute(self) -> list[tuple[str, Optional[int]]]:
+        if self._num_stored:
+            print(f'Reusing {self._num_stored} stored guesses')
 
-        for answer in tqdm(self._previous_answers):
-            res = self._execute_single(answer, cache)
-            if res is not None:
-                solved_guesses_taken.append(res)
+        try:
+            if self._parallelism == Parallelism.Layer:
+                results = self._execute_layered()
+            elif self._use_answer_parallelism():
+                results = self._execute_sharded()
             else:
-                failed.append(answer)
+                results, _ = self.solve_answers(tqdm(self._previous_answers))
+        finally:
+            self.store_cache()
+
+        solved_guesses_taken = [res for _, res in results if res is not None]
+        failed = [answer for answer, res in results if res is None]
 
         solve_percent = len(solved_guesses_taken) / len(self._previous_answers)
         print(f'Able to solve {solve_percent * 100}% of previous answers within {NUMBER_OF_GUESSES} guesses')
@@ -37,8 +130,111 @@ class Executor:
             print(f'Took an average of {sum(solved_guesses_taken) / len(solved_guesses_taken)} guesses per correct answer')
         if failed:
             print(f'Failed to solve {failed}')
+        return results
+
+    def solve_answers(self, answers: list[str]) -> tuple[list[tuple[str, Optional[int]]], GuessCache]:
+        # returns the guesses taken per answer and the cache entries added while solving them
+        num_cached = len(self._cache)
+        results = [(answer, self._execute_single(answer, self._cache)) for answer in answers]
+
+        return results, dict(list(self._cache.items())[num_cached:])
+
+    def profile_stats(self) -> ProfileStats:
+        all_stats = list(self._worker_stats.values())
+        if self._analyzer is not None:
+            all_stats.append(self._analyzer.profile_stats())
+        return merge_stats(all_stats)
+
+    def clear_cache(self):
+        self._cache = {}
+        self._num_stored = 0
+
+    def store_cache(self):
+        # persists the guesses searched since the last store, interrupted runs keep what they finished
+        if self._guess_store is None:
+            return
+        self._guess_store.put_many(dict(list(self._cache.items())[self._num_stored:]))
+        self._num_stored = len(self._cache)
 
-    def _execute_single(self, answer: str, cache: dict[tuple[tuple[str, tuple[SingleResult, ...]], ...], str]) -> Optional[int]:
+    def _use_answer_parallelism(self) -> bool:
+        if self._parallelism != Parallelism.Auto:
+            return self._parallelism == Parallelism.Answer
+        if self._num_processes <= 1:
+            return False
+        # a depth one search is too cheap per candidate to be worth splitting
+        if self._max_search_depth <= 1:
+            return True
+
+        search_width = len(WordReducer(self._all_words, SolveStatusNp(), self._pattern_matrix, self._corpus, self._candidate_ranking, self._num_ranked).get_top_candidates())
+        return search_width < MIN_CANDIDATES_PER_PROCESS * self._num_processes
+
+    def _execute_sharded(self) -> list[tuple[str, Optional[int]]]:
+        answers = self._previous_answers
+        chunk_size = max(1, len(answers) // (self._num_processes * CHUNKS_PER_PROCESS))
+        chunks = [answers[i:i + chunk_size] for i in range(0, len(answers), chunk_size)]
+
+        shared_corpus = SharedCorpus(self._corpus)
+        results = []
+        try:
+            with Pool(
+                    processes=self._num_processes,
+                    initializer=_init_answer_worker,
+                    initargs=(self._candidate_guesser_builder, self._cache_budget_bytes, shared_corpus.handle, self._candidate_ranking, self._num_ranked, self._profile, self._guess_store_path, self._max_search_depth)) as pool:
+                with tqdm(total=len(answers)) as progress:
+                    for chunk_results, chunk_cache, worker_stats in pool.imap_unordered(_solve_answers, chunks):
+                        results.extend(chunk_results)
+                        self._cache.update(chunk_cache)
+                        if worker_stats is not None:
+                            self._worker_stats[worker_stats['workers'][0]['pid']] = worker_stats
+                        progress.update(len(chunk_results))
+        finally:
+            shared_corpus.close()
+
+        order = {answer: i for i, answer in enumerate(answers)}
+        return sorted(results, key=lambda res: order[res[0]])
+
+    def _execute_layered(self) -> list[tuple[str, Optional[int]]]:
+        # every unsolved answer advances one guess per layer, the new states of a layer are searched in one batch
+        analyzer = self._get_analyzer()
+        histories: dict[str, History] = {answer: () for answer in self._previous_answers}
+        results: dict[str, Optional[int]] = {}
+
+        with tqdm(total=len(histories)) as progress:
+            for guesses_taken in range(1, NUMBER_OF_GUESSES + 1):
+                missing = list(dict.fromkeys(history for history in histories.values() if history not in self._cache))
+                for history, guess in zip(missing, analyzer.get_best_guesses(missing)):
+                    self._cache[history] = guess
+
+                for answer in list(histories):
+                    guess = self._cache[histories[answer]]
+                    res = self._get_guess_result(guess, answer)
+                    if all(single == SingleResult.GREEN for single in res):
+                        results[answer] = guesses_taken
+                        del histories[answer]
+                        progress.update()
+                    else:
+                        histories[answer] += ((guess, to_pattern_id(res)),)
+
+        return [(answer, results.get(answer)) for answer in self._previous_answers]
+
+    def _get_analyzer(self) -> Analyzer:
+        if self._analyzer is None:
+            self._analyzer = Analyzer(
+                self._candidate_guesser_builder,
+                self._all_words,
+                self._starting_word,
+                self._num_processes,
+                max_search_depth=self._max_search_depth,
+                progress_bar=False,
+                cache_budget_bytes=self._cache_budget_bytes,
+                in_process=self._in_process,
+                corpus=self._corpus,
+                candidate_ranking=self._candidate_ranking,
+                num_ranked=self._num_ranked,
+                profile=self._profile)
+        return self._analyzer
+
+    def _execute_single(self, answer: str, cache: GuessCache) -> Optional[int]:
         try:
             return self._execute_single_uncaught(answer, cache)
         except Exception as e:
@@ -46,27 +242,29 @@ class Executor:
             print(traceback.format_exc())
             return None
         finally:
-            self._analyzer.reset()
+            self._get_analyzer().reset()
 
-    def _execute_single_uncaught(self, answer: str, cache: dict[tuple[tuple[str, tuple[SingleResult, ...]], ...], str]) -> Optional[int]:
-        curr_answers = []
+    def _execute_single_uncaught(self, answer: str, cache: GuessCache) -> Optional[int]:
+        history: History = ()
+        analyzer = self._get_analyzer()
 
-        while len(curr_answers) < NUMBER_OF_GUESSES:
-            key = tuple(curr_answers)
-            if key not in cache:
-                cache[key] = self._analyzer.get_best_guess()
+        while len(history) < NUMBER_OF_GUESSES:
+            if history not in cache:
+                cache[history] = analyzer.get_best_guess()
 
-            curr_guess = cache[key]
+            curr_guess = cache[history]
 
-            res = get_guess_result(curr_guess, answer)
-            curr_answers.append((curr_guess, tuple(res)))
+            res = self._get_guess_result(curr_guess, answer)
+            history += ((curr_guess, to_pattern_id(res)),)
 
             if all(single == SingleResult.GREEN for single in res):
-                return len(curr_answers)
-            
-            self._analyzer.update(res, curr_guess)
-            
+                return len(history)
+
+            analyzer.update(res, curr_guess)
+
         return None
 
-    def _build_analyzer(self) -> Analyzer:
-        return Analyzer(self._candidate_guesser_builder, self._all_words, self._starting_word, max_search_depth=1, progress_bar=False)
\ No newline at end of file
+    def _get_guess_result(self, guess: str, answer: str) -> GuessResult:
+        if self._pattern_matrix is None or answer not in self._word_idxs:
+            return get_guess_result(guess, answer)
+        return from_pattern_id(self._pattern_matrix[self._word_idxs[guess], self._word_idxs[answer]])
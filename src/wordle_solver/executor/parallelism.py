@@ -0,0 +1,27 @@
+from enum import Enum, auto
+from typing import Self
+
+
+class Parallelism(Enum):
+    Auto = auto(),
+    Answer = auto(),
+    Candidate = auto(),
+    Layer = auto()
+
+    @classmethod
+    def from_string(cls, s: str) -> Self:
+        cleaned = ''.join(c for c in s.lower() if c.isalpha())
+
+        for k, valid in _INPUT_MAPPING.items():
+            if cleaned in valid:
+                return k
+
+        raise TypeError(f'{s} invalid as Parallelism input')
+
+
+_INPUT_MAPPING: dict[Parallelism, tuple[str, ...]] = {
+    Parallelism.Auto: ('auto',),
+    Parallelism.Answer: ('answer', 'answers', 'answerlevel'),
+    Parallelism.Candidate: ('candidate', 'candidates', 'candidatelevel'),
+    Parallelism.Layer: ('layer', 'layers', 'layerlevel', 'depth')
+}
@@ -3,7 +3,11 @@ import os
 
 from wordle_solver.analyzer.candidate_guess.candidate_guesser_factory import CandidateGuesserFactory
 from wordle_solver.analyzer.candidate_guess.guesser_type import GuesserType
+from wordle_solver.analyzer.scorer.scorer_daemon import parse_address
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
 from wordle_solver.solver.solver import Solver
+from wordle_solver.util.constants import GUESS_STORE_PATH
+from wordle_solver.util.profiler import report_stats
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--recompute_start', default=False, action='store_true')
@@ -12,16 +16,33 @@ parser.add_argument('-g', '--candidate_guessing_strategy', type=GuesserType.from
 parser.add_argument('--num_common_chars', type=int, default=2)
 parser.add_argument('--num_candidate_guesses', type=int, default=100)
 parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+parser.add_argument('--exact_scoring', default=False, action='store_true')
+parser.add_argument('--cache_budget_mb', type=int, default=64)
+parser.add_argument('--no_pruning', default=False, action='store_true')
+parser.add_argument('-r', '--candidate_ranking', type=CandidateRanking.from_string, default=CandidateRanking.Heuristic)
+parser.add_argument('-k', '--num_ranked', type=int, default=DEFAULT_NUM_RANKED)
+parser.add_argument('--time_budget_ms', type=int, default=None, help='search deeper only while this budget per guess lasts, the deepest finished depth picks the guess')
+parser.add_argument('--guess_store', default=GUESS_STORE_PATH, help='sqlite file best guesses are shared through across runs')
+parser.add_argument('--no_guess_store', default=False, action='store_true')
+parser.add_argument('--profile', default=False, action='store_true')
+parser.add_argument('--profile_output', default=None)
+parser.add_argument('--remote_workers', type=parse_address, nargs='+', default=None, help='host:port of scorer-worker daemons to search on instead of local processes')
 
 
 def main():
     args = parser.parse_args()
     use_computed_start = not args.recompute_start
+    profile = args.profile or args.profile_output is not None
+    guess_store_path = None if args.no_guess_store else args.guess_store
 
     candidate_guesser_factory = CandidateGuesserFactory(args.candidate_guessing_strategy, args.num_common_chars, args.num_candidate_guesses)
     candidate_guesser_builder = candidate_guesser_factory.build()
-    solver = Solver(candidate_guesser_builder, args.num_processes, use_computed_start=use_computed_start, max_search_depth=args.max_search_depth)
-    solver.play()
+    solver = Solver(candidate_guesser_builder, args.num_processes, use_computed_start=use_computed_start, max_search_depth=args.max_search_depth, exact_scoring=args.exact_scoring, cache_budget_bytes=args.cache_budget_mb * 1024 * 1024, pruning=not args.no_pruning, candidate_ranking=args.candidate_ranking, num_ranked=args.num_ranked, profile=profile, remote_workers=args.remote_workers, guess_store_path=guess_store_path, time_budget_ms=args.time_budget_ms)
+    try:
+        solver.play()
+    finally:
+        if profile:
+            report_stats(solver.profile_stats(), args.profile_output)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,53 @@
+import argparse
+import os
+
+from wordle_solver.analyzer.guess_store import get_strategy
+from wordle_solver.analyzer.opener_ranking import OpenerCheckpoint, get_ranking, get_setup_digest, rank_openers, write_ranking
+from wordle_solver.analyzer.scorer.scorer_pool import ScorerPool
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.util.constants import BEST_STARTING_WORD_PATH, NUMBER_OF_GUESSES, OPENER_CHECKPOINT_PATH, OPENER_RANKING_PATH
+
+parser = argparse.ArgumentParser(description='Scores every word as the first guess, resuming from the checkpoint of an earlier run')
+parser.add_argument('-d', '--max_search_depth', type=int, default=1)
+parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+parser.add_argument('--cache_budget_mb', type=int, default=64)
+parser.add_argument('-r', '--candidate_ranking', type=CandidateRanking.from_string, default=CandidateRanking.Heuristic)
+parser.add_argument('-k', '--num_ranked', type=int, default=DEFAULT_NUM_RANKED)
+parser.add_argument('--time_budget_s', type=float, default=None, help='stop starting new batches after this many seconds, rerun to continue')
+parser.add_argument('--checkpoint', default=OPENER_CHECKPOINT_PATH)
+parser.add_argument('-o', '--output', default=OPENER_RANKING_PATH)
+parser.add_argument('--starting_word_output', default=BEST_STARTING_WORD_PATH)
+parser.add_argument('--top', type=int, default=10)
+
+
+def main():
+    args = parser.parse_args()
+    corpus = load_corpus()
+    words = corpus.words.tolist()
+    max_search_depth = min(args.max_search_depth, NUMBER_OF_GUESSES)
+    strategy = get_strategy(args.candidate_ranking, args.num_ranked, False, None)
+    checkpoint = OpenerCheckpoint(args.checkpoint, get_setup_digest(words, corpus, max_search_depth, strategy))
+
+    pool = ScorerPool(args.num_processes, words, 0, NUMBER_OF_GUESSES, max_search_depth, False, corpus=corpus, cache_budget_bytes=args.cache_budget_mb * 1024 * 1024, candidate_ranking=args.candidate_ranking, num_ranked=args.num_ranked)
+    try:
+        evs = rank_openers(pool, words, corpus, checkpoint, args.time_budget_s)
+    finally:
+        pool.close()
+
+    ranking = get_ranking(words, evs)
+    write_ranking(ranking, args.output)
+    for rank, (word, ev) in enumerate(ranking[:args.top], 1):
+        print(f'{rank}. {word} {ev:.4f}')
+
+    if len(evs) < len(words):
+        print(f'Scored {len(evs)} of {len(words)} openers, rerun to continue from {args.checkpoint}')
+        return
+
+    with open(args.starting_word_output, 'w') as f:
+        f.write(f'{ranking[0][0]}\n')
+    print(f'Wrote {len(ranking)} openers to {args.output} and {ranking[0][0]} to {args.starting_word_output}')
+
+
+if __name__ == '__main__':
+    main()
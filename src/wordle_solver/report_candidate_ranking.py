@@ -0,0 +1,87 @@
+import argparse
+import numpy as np
+import os
+
+from wordle_solver.analyzer.scorer.scorer_pool import ScorerPool
+from wordle_solver.common.candidate_ranking import CandidateRanking
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.common.guess_result import get_guess_result, to_res_arr
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.util.constants import NUMBER_OF_GUESSES
+from wordle_solver.util.utils import get_best_starting_word, get_previous_answers
+
+RANKINGS = (CandidateRanking.Entropy, CandidateRanking.Mass)
+
+parser = argparse.ArgumentParser(description='Scores every guess after the starting word and reports where the best one lands in the candidate rankings')
+parser.add_argument('-k', '--num_ranked', type=int, nargs='+', default=[25, 50, 100, 200])
+parser.add_argument('-n', '--num_states', type=int, default=25)
+parser.add_argument('-d', '--max_search_depth', type=int, default=1)
+parser.add_argument('-s', '--starting_word', default=None)
+parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+parser.add_argument('--seed', type=int, default=0)
+
+
+def main():
+    args = parser.parse_args()
+    starting_word = args.starting_word or get_best_starting_word()
+    if starting_word is None:
+        parser.error('no starting word given and no best starting word computed')
+
+    corpus = load_corpus()
+    words = corpus.words.tolist()
+    pattern_matrix = load_pattern_matrix(words)
+    max_search_depth = min(args.max_search_depth, NUMBER_OF_GUESSES)
+    rng = np.random.default_rng(args.seed)
+    answers = rng.permutation(get_previous_answers())
+
+    pool = ScorerPool(args.num_processes, words, 1, NUMBER_OF_GUESSES, max_search_depth, False, corpus=corpus)
+    ranks = {ranking: [] for ranking in RANKINGS}
+    ranked_regrets = {(ranking, k): [] for ranking in RANKINGS for k in args.num_ranked}
+    heuristic_regrets = []
+    try:
+        for answer in answers:
+            if len(heuristic_regrets) == args.num_states:
+                break
+
+            res = get_guess_result(starting_word, answer)
+            ss = SolveStatusNp()
+            reducer = WordReducer(words, ss, pattern_matrix, corpus, CandidateRanking.Heuristic)
+            ss.update(reducer.get_guess_arr(starting_word), to_res_arr(starting_word, res))
+            reducer.update()
+            if reducer.num_answers() == 1:
+                continue
+
+            pool.update(starting_word, res)
+            evs = np.array(pool.process(range(len(words)), len(words)))
+            pool.reset()
+
+            best_ev = np.min(evs)
+            for ranking in RANKINGS:
+                order = reducer.get_ranked_candidates(ranking, len(words))
+                ranks[ranking].append(order.index(np.argmin(evs)) + 1)
+                for k in args.num_ranked:
+                    ranked_regrets[ranking, k].append(np.min(evs[reducer.get_ranked_candidates(ranking, k)]) - best_ev)
+            heuristic_regrets.append(np.min(evs[reducer.get_top_candidates()]) - best_ev)
+    finally:
+        pool.close()
+
+    print(f'{len(heuristic_regrets)} states after {starting_word}')
+    for ranking in RANKINGS:
+        print(f'true best guess has median {ranking.name.lower()} rank {np.median(ranks[ranking]):g} (worst {max(ranks[ranking])})')
+
+    print(f'{"candidates":>12} {"best missed":>12} {"mean EV regret":>15}')
+    for ranking in RANKINGS:
+        for k in args.num_ranked:
+            _print_row(f'{ranking.name.lower()} {k}', ranked_regrets[ranking, k])
+    _print_row('heuristic', heuristic_regrets)
+
+
+def _print_row(name: str, regrets: list[float]):
+    missed = np.mean(np.array(regrets) > 0) * 100
+    print(f'{name:>12} {missed:>11.1f}% {np.mean(regrets):>15.5f}')
+
+
+if __name__ == '__main__':
+    main()
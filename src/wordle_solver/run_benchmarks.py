@@ -0,0 +1,43 @@
+import argparse
+import sys
+
+from wordle_solver.benchmark.cases import CASES
+from wordle_solver.benchmark.compare import DEFAULT_THRESHOLD, compare_results, get_regressions
+from wordle_solver.benchmark.runner import DEFAULT_REPEATS, load_results, run_benchmarks, save_results
+from wordle_solver.util.constants import BENCHMARK_BASELINE_PATH, BENCHMARK_RESULTS_PATH
+
+parser = argparse.ArgumentParser()
+subparsers = parser.add_subparsers(dest='command', required=True)
+
+run_parser = subparsers.add_parser('run')
+run_parser.add_argument('-c', '--cases', nargs='+', choices=list(CASES), default=list(CASES))
+run_parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS)
+run_parser.add_argument('-o', '--output', default=BENCHMARK_RESULTS_PATH)
+
+compare_parser = subparsers.add_parser('compare')
+compare_parser.add_argument('current', nargs='?', default=BENCHMARK_RESULTS_PATH)
+compare_parser.add_argument('-b', '--baseline', default=BENCHMARK_BASELINE_PATH)
+compare_parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+
+def main():
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        save_results(run_benchmarks(args.cases, args.repeats), args.output)
+        print(f'Wrote results to {args.output}')
+        return
+
+    comparisons = compare_results(load_results(args.baseline), load_results(args.current))
+    regressions = get_regressions(comparisons, args.threshold)
+    for name, base, curr, ratio in comparisons:
+        flag = ' REGRESSION' if (name, base, curr, ratio) in regressions else ''
+        print(f'{name:>22} {base:>10.4f}s -> {curr:>10.4f}s {ratio:>6.2f}x{flag}')
+
+    if regressions:
+        print(f'{len(regressions)} of {len(comparisons)} benchmarks regressed by more than {args.threshold * 100:g}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
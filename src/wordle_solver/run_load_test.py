@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import numpy as np
+import os
+import tempfile
+
+from wordle_solver.serve import add_server_arguments, start_server
+from wordle_solver.server.load_generator import run_load
+from wordle_solver.util.utils import get_previous_answers
+
+parser = argparse.ArgumentParser(description='Plays previous answers against a solver server, a local one unless --connect is given')
+add_server_arguments(parser)
+parser.add_argument('--connect', default=False, action='store_true')
+parser.add_argument('-n', '--games', type=int, default=50)
+parser.add_argument('-c', '--concurrency', type=int, default=8)
+parser.add_argument('--seed', type=int, default=0)
+
+
+async def _run(args: argparse.Namespace):
+    answers = list(np.random.default_rng(args.seed).permutation(get_previous_answers())[:args.games])
+
+    server = pool = None
+    if not args.connect:
+        args.unix = os.path.join(tempfile.mkdtemp(), 'solver.sock')
+        server, pool = await start_server(args)
+
+    if args.unix is not None:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+
+    try:
+        report = await run_load(connect, answers, args.concurrency)
+        print(report.summary())
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            pool.close()
+            os.remove(args.unix)
+            os.rmdir(os.path.dirname(args.unix))
+
+
+def main():
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import argparse
+
+from wordle_solver.analyzer.scorer.scorer_daemon import AUTHKEY_ENV, DEFAULT_AUTHKEY, get_authkey, is_loopback, run_scorer_daemon
+
+parser = argparse.ArgumentParser(description='Runs one scorer worker that solvers reach with --remote_workers host:port')
+parser.add_argument('--host', default='127.0.0.1')
+parser.add_argument('--port', type=int, required=True)
+parser.add_argument('--authkey', default=None, help=f'shared with solvers through {AUTHKEY_ENV}, required unless --host is a loopback address')
+
+
+def main():
+    args = parser.parse_args()
+    authkey = get_authkey() if args.authkey is None else args.authkey.encode()
+    if authkey == DEFAULT_AUTHKEY and not is_loopback(args.host):
+        parser.error(f'--authkey or {AUTHKEY_ENV} is required when --host is not a loopback address')
+
+    try:
+        run_scorer_daemon((args.host, args.port), authkey)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.common.pattern_matrix import load_pattern_matrix
+from wordle_solver.server.scheduler import AsyncScorerPool
+from wordle_solver.server.server import SolverServer
+from wordle_solver.util.constants import NUMBER_OF_GUESSES
+from wordle_solver.util.utils import get_best_starting_word
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--unix', default=None, help='listen on this UNIX socket instead of TCP')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--recompute_start', default=False, action='store_true')
+    parser.add_argument('-d', '--max_search_depth', type=int, default=1)
+    parser.add_argument('--num_processes', type=int, default=os.cpu_count())
+    parser.add_argument('--cache_budget_mb', type=int, default=64)
+    parser.add_argument('--no_pruning', default=False, action='store_true')
+    parser.add_argument('-r', '--candidate_ranking', type=CandidateRanking.from_string, default=CandidateRanking.Heuristic)
+    parser.add_argument('-k', '--num_ranked', type=int, default=DEFAULT_NUM_RANKED)
+
+
+async def start_server(args: argparse.Namespace) -> tuple[asyncio.Server, AsyncScorerPool]:
+    corpus = load_corpus()
+    words = corpus.words.tolist()
+    starting_word = None if args.recompute_start else get_best_starting_word()
+    max_search_depth = min(args.max_search_depth, NUMBER_OF_GUESSES)
+
+    pool = AsyncScorerPool(
+        args.num_processes,
+        words,
+        0 if starting_word is None else 1,
+        NUMBER_OF_GUESSES,
+        max_search_depth,
+        corpus,
+        args.cache_budget_mb * 1024 * 1024,
+        not args.no_pruning,
+        args.candidate_ranking,
+        args.num_ranked)
+    solver_server = SolverServer(pool, words, corpus, load_pattern_matrix(words), starting_word, max_search_depth, args.candidate_ranking, args.num_ranked)
+
+    if args.unix is not None:
+        server = await asyncio.start_unix_server(solver_server.handle_client, args.unix)
+    else:
+        server = await asyncio.start_server(solver_server.handle_client, args.host, args.port)
+    return server, pool
+
+
+parser = argparse.ArgumentParser()
+add_server_arguments(parser)
+
+
+async def _serve(args: argparse.Namespace):
+    server, pool = await start_server(args)
+    try:
+        print(f'Serving on {args.unix or f"{args.host}:{args.port}"}')
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.close()
+
+
+def main():
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import numpy as np
+import time
+from typing import Any, Awaitable, Callable, Iterator
+
+from wordle_solver.common.guess_result import get_guess_result
+from wordle_solver.common.single_result import SingleResult
+from wordle_solver.util.constants import NUMBER_OF_GUESSES
+
+type Connect = Callable[[], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+
+
+class _Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+
+    async def request(self, **request: Any) -> dict[str, Any]:
+        self._next_id += 1
+        self._writer.write(json.dumps({'id': self._next_id, **request}).encode() + b'\n')
+        await self._writer.drain()
+
+        reply = json.loads(await self._reader.readline())
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    def close(self):
+        self._writer.close()
+
+
+class LoadReport:
+    def __init__(self, elapsed: float, guesses_taken: list[int], latencies: list[float]):
+        self.elapsed = elapsed
+        self.guesses_taken = guesses_taken
+        self.latencies = latencies
+
+    def summary(self) -> str:
+        solved = [guesses for guesses in self.guesses_taken if guesses is not None]
+        latencies_ms = np.array(self.latencies) * 1000
+        return '\n'.join([
+            f'{len(self.guesses_taken)} games in {self.elapsed:.2f}s, {len(self.guesses_taken) / self.elapsed:.2f} games/s, {len(self.latencies) / self.elapsed:.2f} guesses/s',
+            f'solved {len(solved)} with an average of {np.mean(solved) if solved else float("nan"):.3f} guesses',
+            f'guess latency p50 {np.percentile(latencies_ms, 50):.1f}ms, p99 {np.percentile(latencies_ms, 99):.1f}ms, max {np.max(latencies_ms):.1f}ms',
+        ])
+
+
+async def _play(client: _Client, answer: str, latencies: list[float]) -> int | None:
+    session = (await client.request(op='new'))['session']
+    try:
+        for guesses in range(1, NUMBER_OF_GUESSES + 1):
+            start = time.perf_counter()
+            guess = (await client.request(op='guess', session=session))['guess']
+            latencies.append(time.perf_counter() - start)
+
+            result = get_guess_result(guess, answer)
+            if all(single == SingleResult.GREEN for single in result):
+                return guesses
+            await client.request(op='update', session=session, guess=guess, result=[int(single) for single in result])
+        return None
+    finally:
+        await client.request(op='close', session=session)
+
+
+async def run_load(connect: Connect, answers: list[str], concurrency: int) -> LoadReport:
+    # every simulated player keeps its own connection and plays games back to back
+    pending: Iterator[str] = iter(answers)
+    guesses_taken = []
+    latencies = []
+
+    async def player():
+        client = _Client(*await connect())
+        try:
+            for answer in pending:
+                guesses_taken.append(await _play(client, answer, latencies))
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player() for _ in range(concurrency)))
+    return LoadReport(time.perf_counter() - start, guesses_taken, latencies)
@@ -0,0 +1,121 @@
+import asyncio
+from collections import deque
+from decimal import Decimal
+from multiprocessing.connection import Connection
+from typing import Hashable
+
+from wordle_solver.analyzer.scorer.scorer_child import PROCESS_STATE, History
+from wordle_solver.analyzer.scorer.scorer_pool import shutdown_scorer_workers, start_scorer_workers
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus, SharedCorpus
+
+
+class AsyncScorerPool:
+    # scores (state, candidate) items for many sessions on one set of warm workers
+    # sessions with queued work take turns, so one deep search cannot starve the others
+    def __init__(
+            self,
+            num_processes: int,
+            words: list[str],
+            starting_guesses: int,
+            max_guesses: int,
+            max_depth: int,
+            corpus: Corpus,
+            cache_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+            pruning: bool = True,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED):
+        self._shared_corpus = SharedCorpus(corpus)
+        init_args = (words, starting_guesses, max_guesses, max_depth, False, self._shared_corpus.handle, cache_budget_bytes, pruning, candidate_ranking, num_ranked)
+        self._conns, self._processes = start_scorer_workers(num_processes, init_args)
+
+        self._loop = asyncio.get_running_loop()
+        self._idle: list[Connection] = list(self._conns)
+        # the state each worker was last moved to, items go to a worker already there when one is idle
+        self._worker_histories: dict[Connection, History] = {conn: () for conn in self._conns}
+        self._queues: dict[Hashable, deque[tuple[History, int, asyncio.Future]]] = {}
+        self._rotation: deque[Hashable] = deque()
+        self._in_flight: dict[Connection, asyncio.Future] = {}
+
+        for conn in self._conns:
+            self._loop.add_reader(conn.fileno(), self._on_readable, conn)
+
+    async def score(self, session_id: Hashable, history: History, indexes: list[int]) -> list[float | Decimal]:
+        if not self._conns:
+            raise RuntimeError('no scorer workers left')
+        futures = [self._loop.create_future() for _ in indexes]
+        if session_id not in self._queues:
+            self._queues[session_id] = deque()
+            self._rotation.append(session_id)
+        self._queues[session_id].extend((history, i, future) for i, future in zip(indexes, futures))
+
+        self._dispatch()
+        return await asyncio.gather(*futures)
+
+    def close(self):
+        for conn in self._conns:
+            self._loop.remove_reader(conn.fileno())
+        for future in self._in_flight.values():
+            future.cancel()
+        shutdown_scorer_workers(self._conns, self._processes, self._shared_corpus)
+
+    def _dispatch(self):
+        while self._idle and self._rotation:
+            session_id = self._rotation.popleft()
+            queue = self._queues[session_id]
+            history, word_i, future = queue.popleft()
+            if queue:
+                self._rotation.append(session_id)
+            else:
+                del self._queues[session_id]
+
+            if future.cancelled():
+                continue
+
+            conn = next((conn for conn in self._idle if self._worker_histories[conn] == history), self._idle[-1])
+            self._idle.remove(conn)
+            self._worker_histories[conn] = history
+            self._in_flight[conn] = future
+            try:
+                conn.send((PROCESS_STATE, (history, word_i)))
+            except OSError:
+                self._drop_worker(conn)
+
+    def _on_readable(self, conn: Connection):
+        try:
+            ok, value = conn.recv()
+        except (EOFError, OSError):
+            self._drop_worker(conn)
+            self._dispatch()
+            return
+
+        future = self._in_flight.pop(conn)
+        self._idle.append(conn)
+
+        if not future.cancelled():
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        self._dispatch()
+
+    def _drop_worker(self, conn: Connection):
+        # the item a worker died on is failed rather than retried, it could take the next worker down too
+        self._loop.remove_reader(conn.fileno())
+        self._conns.remove(conn)
+        if conn in self._idle:
+            self._idle.remove(conn)
+        del self._worker_histories[conn]
+        conn.close()
+
+        error = RuntimeError('scorer worker exited')
+        if (future := self._in_flight.pop(conn, None)) is not None and not future.done():
+            future.set_exception(error)
+        if not self._conns:
+            for queue in self._queues.values():
+                for _, _, future in queue:
+                    if not future.done():
+                        future.set_exception(error)
+            self._queues.clear()
+            self._rotation.clear()
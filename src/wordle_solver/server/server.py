@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+import json
+import numpy as np
+from typing import Any, Optional
+
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.single_result import SingleResult
+from wordle_solver.server.scheduler import AsyncScorerPool
+from wordle_solver.server.session import GameSession
+from wordle_solver.util.constants import WORD_LENGTH
+
+# requests and replies are one JSON object per line, replies carry the request id and come back as they finish
+# {"op": "new"} -> {"session": "..."}
+# {"op": "guess", "session": "..."} -> {"guess": "tares"}
+# {"op": "update", "session": "...", "guess": "tares", "result": [0, 1, 2, 0, 0]} -> {"answers": 42}
+# {"op": "close", "session": "..."} -> {}
+
+
+class RequestError(Exception):
+    pass
+
+
+def _parse_result(raw: Any) -> list[SingleResult]:
+    if not isinstance(raw, list) or len(raw) != WORD_LENGTH:
+        raise RequestError(f'result needs to be a list of {WORD_LENGTH} colors')
+
+    ret = [SingleResult.from_string(str(single)) for single in raw]
+    if any(single is None for single in ret):
+        raise RequestError(f'could not read result {raw}')
+    return ret
+
+
+class SolverServer:
+    def __init__(
+            self,
+            pool: AsyncScorerPool,
+            words: list[str],
+            corpus: Corpus,
+            pattern_matrix: Optional[np.ndarray],
+            starting_word: Optional[str],
+            max_search_depth: int,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED):
+        self._pool = pool
+        self._words = words
+        self._word_idxs = {word: i for i, word in enumerate(words)}
+        self._corpus = corpus
+        self._pattern_matrix = pattern_matrix
+        self._starting_word = starting_word
+        self._max_search_depth = max_search_depth
+        self._candidate_ranking = candidate_ranking
+        self._num_ranked = num_ranked
+
+        self._sessions: dict[str, GameSession] = {}
+        self._session_ids = itertools.count()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            reply = await self.handle(request)
+        except Exception as e:
+            # anything a request raises, worker errors included, still gets a reply
+            reply = {'error': str(e) or type(e).__name__}
+
+        writer.write(json.dumps({'id': request_id, **reply}).encode() + b'\n')
+        await writer.drain()
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = request.get('op')
+        if op == 'new':
+            session_id = str(next(self._session_ids))
+            self._sessions[session_id] = GameSession(
+                self._words,
+                self._corpus,
+                self._pattern_matrix,
+                self._starting_word,
+                self._max_search_depth,
+                self._candidate_ranking,
+                self._num_ranked)
+            return {'session': session_id}
+
+        session_id = request.get('session')
+        if session_id not in self._sessions:
+            raise RequestError(f'unknown session {session_id}')
+        session = self._sessions[session_id]
+
+        if op == 'guess':
+            return {'guess': await self._get_best_guess(session_id, session)}
+        elif op == 'update':
+            word = request.get('guess')
+            if word not in self._word_idxs:
+                raise RequestError(f'{word} is not a valid guess')
+            session.update(word, _parse_result(request.get('result')))
+            return {'answers': session.num_answers()}
+        elif op == 'close':
+            del self._sessions[session_id]
+            return {}
+
+        raise RequestError(f'unknown op {op}')
+
+    async def _get_best_guess(self, session_id: str, session: GameSession) -> str:
+        if (word := session.get_direct_guess()) is not None:
+            return word
+
+        candidates = session.get_candidates()
+        evs = await self._pool.score(session_id, session.history, candidates)
+        return self._words[candidates[int(np.argmin(evs))]]
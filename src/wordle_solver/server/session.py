@@ -0,0 +1,47 @@
+import numpy as np
+from typing import Optional
+
+from wordle_solver.analyzer.scorer.scorer_child import History, get_base_word_and_distr
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import GuessResult, to_pattern_id, to_res_arr
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.util.constants import NUMBER_OF_GUESSES
+
+
+class GameSession:
+    # the state of one game, scoring happens in the shared pool from its history
+    def __init__(
+            self,
+            words: list[str],
+            corpus: Corpus,
+            pattern_matrix: Optional[np.ndarray],
+            starting_word: Optional[str],
+            max_search_depth: int,
+            candidate_ranking: CandidateRanking = CandidateRanking.Heuristic,
+            num_ranked: int = DEFAULT_NUM_RANKED):
+        self._starting_word = starting_word
+        self._max_search_depth = max_search_depth
+        self._ss = SolveStatusNp()
+        self._word_reducer = WordReducer(words, self._ss, pattern_matrix, corpus, candidate_ranking, num_ranked)
+        self.history: History = ()
+
+    def update(self, word: str, results: GuessResult):
+        self._ss.update(self._word_reducer.get_guess_arr(word), to_res_arr(word, results))
+        self._word_reducer.update()
+        self.history += ((word, to_pattern_id(results)),)
+
+    def num_answers(self) -> int:
+        return self._word_reducer.num_answers()
+
+    def get_direct_guess(self) -> Optional[str]:
+        # the guess when no search is needed, same rules as Analyzer and Scorer
+        if not self.history and self._starting_word is not None:
+            return self._starting_word
+        if (res := get_base_word_and_distr(self._word_reducer, NUMBER_OF_GUESSES, self._max_search_depth, len(self.history), 0)) is not None:
+            return res[0]
+        return None
+
+    def get_candidates(self) -> list[int]:
+        return self._word_reducer.get_top_candidates()
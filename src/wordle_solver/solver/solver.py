@@ -2,9 +2,17 @@ from typing import Callable, Optional
 
 from wordle_solver.analyzer.analyzer import Analyzer
 from wordle_solver.analyzer.candidate_guess.candidate_guesser import CandidateGuesser
+from wordle_solver.analyzer.guess_store import GuessStore, get_strategy
+from wordle_solver.analyzer.scorer.scorer_child import History
+from wordle_solver.analyzer.scorer.scorer_daemon import Address
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.corpus import load_corpus
+from wordle_solver.common.guess_result import to_pattern_id
 from wordle_solver.common.single_result import SingleResult
-from wordle_solver.util.constants import WORD_LENGTH
-from wordle_solver.util.utils import read_all_words, get_best_starting_word
+from wordle_solver.util.constants import NUMBER_OF_GUESSES, WORD_LENGTH
+from wordle_solver.util.profiler import ProfileStats
+from wordle_solver.util.utils import get_best_starting_word
 
 
 def _read_input(user_input_str: str) -> Optional[list[SingleResult]]:
@@ -31,23 +39,50 @@ def _get_input() -> list[SingleResult]:
 
 
 class Solver:
-    def __init__(self, candidate_guesser_builder: Callable[[], CandidateGuesser], num_processes: int, use_computed_start: bool = True, max_search_depth: Optional[int] = None):
-        self._all_words = read_all_words()
+    def __init__(self, candidate_guesser_builder: Callable[[], CandidateGuesser], num_processes: int, use_computed_start: bool = True, max_search_depth: Optional[int] = None, exact_scoring: bool = False, cache_budget_bytes: int = DEFAULT_BUDGET_BYTES, pruning: bool = True, candidate_ranking: CandidateRanking = CandidateRanking.Heuristic, num_ranked: int = DEFAULT_NUM_RANKED, profile: bool = False, remote_workers: Optional[list[Address]] = None, guess_store_path: Optional[str] = None, time_budget_ms: Optional[int] = None):
+        corpus = load_corpus()
+        self._all_words = corpus.words.tolist()
         word = None
         if use_computed_start:
             word = get_best_starting_word()
 
-        self._analyzer = Analyzer(candidate_guesser_builder, self._all_words, word, num_processes, max_search_depth)
+        self._analyzer = Analyzer(candidate_guesser_builder, self._all_words, word, num_processes, max_search_depth, exact_scoring=exact_scoring, cache_budget_bytes=cache_budget_bytes, pruning=pruning, candidate_ranking=candidate_ranking, num_ranked=num_ranked, profile=profile, corpus=corpus, remote_workers=remote_workers, time_budget_s=None if time_budget_ms is None else time_budget_ms / 1000)
+        self._report_depth = time_budget_ms is not None
+
+        self._guess_store = None
+        if guess_store_path is not None:
+            store_depth = NUMBER_OF_GUESSES if max_search_depth is None else min(max_search_depth, NUMBER_OF_GUESSES)
+            self._guess_store = GuessStore(self._all_words, corpus, store_depth, get_strategy(candidate_ranking, num_ranked, exact_scoring, word), guess_store_path)
 
     def play(self):
+        history: History = ()
         while True:
-            best_word = self._analyzer.get_best_guess()
+            best_word = self._get_best_guess(history)
 
-            print(f'You should guess: {best_word}')
+            depth, _ = self._analyzer.last_search()
+            if self._report_depth and depth is not None:
+                print(f'You should guess: {best_word} (searched to depth {depth})')
+            else:
+                print(f'You should guess: {best_word}')
 
             result = _get_input()
             if all(single == SingleResult.GREEN for single in result):
                 print(f'Great win!')
                 return
             
-            self._analyzer.update(result)
+            self._analyzer.update(result, best_word)
+            history += ((best_word, to_pattern_id(result)),)
+
+    def _get_best_guess(self, history: History) -> str:
+        if self._guess_store is None:
+            return self._analyzer.get_best_guess()
+
+        if (word := self._guess_store.get(history)) is None:
+            word = self._analyzer.get_best_guess()
+            # a guess from a search the time budget cut short is not what a full search would store
+            if self._analyzer.last_search()[1]:
+                self._guess_store.put(history, word)
+        return word
+
+    def profile_stats(self) -> ProfileStats:
+        return self._analyzer.profile_stats()
@@ -7,3 +7,11 @@ WORD_SCORES_PATH = 'word-scores.txt'
 BEST_STARTING_WORD_PATH = 'best-starting-word.txt'
 WORD_FREQUENCIES_PATH = 'word_frequencies.txt'
 PREVIOUS_ANSWERS_PATH = 'previous-answers.txt'
+PATTERN_MATRIX_PATH = 'pattern-matrix.bin'
+OPENING_BOOK_PATH = 'opening-book.npz'
+GUESS_STORE_PATH = 'guess-store.sqlite'
+OPENER_RANKING_PATH = 'opener-ranking.txt'
+OPENER_CHECKPOINT_PATH = 'opener-ranking.checkpoint'
+CORPUS_PATH = 'corpus.npz'
+BENCHMARK_BASELINE_PATH = 'benchmark-baseline.json'
+BENCHMARK_RESULTS_PATH = 'benchmark-results.json'
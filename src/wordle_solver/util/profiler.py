@@ -0,0 +1,116 @@
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import time
+from typing import Any, ContextManager, Iterable, Iterator, Optional
+
+# counters are summed, timers keep total seconds, calls and the slowest call, workers list one entry per process
+type ProfileStats = dict[str, Any]
+
+_NULL_CONTEXT = nullcontext()
+
+
+def get_rss_bytes() -> int:
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Profiler:
+    # every method is a cheap no-op while disabled, so hot paths can call it unconditionally
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timers: dict[str, list[float]] = {}
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self._counters[name] += amount
+
+    def time(self, name: str) -> ContextManager:
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._time(name)
+
+    @contextmanager
+    def _time(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        timer = self._timers.setdefault(name, [0.0, 0, 0.0])
+        timer[0] += seconds
+        timer[1] += 1
+        timer[2] = max(timer[2], seconds)
+
+    def stats(self, counters: Optional[dict[str, int]] = None) -> ProfileStats:
+        return {
+            'counters': dict(self._counters) | (counters or {}),
+            'timers': {name: {'seconds': total, 'calls': calls, 'max_seconds': slowest} for name, (total, calls, slowest) in self._timers.items()},
+            'workers': [{'pid': os.getpid(), 'rss_bytes': get_rss_bytes()}],
+        }
+
+    def clear(self):
+        self._counters.clear()
+        self._timers.clear()
+
+
+def merge_stats(all_stats: Iterable[ProfileStats]) -> ProfileStats:
+    counters = defaultdict(int)
+    timers = {}
+    workers = []
+
+    for stats in all_stats:
+        for name, value in stats['counters'].items():
+            counters[name] += value
+        for name, timer in stats['timers'].items():
+            merged = timers.setdefault(name, {'seconds': 0.0, 'calls': 0, 'max_seconds': 0.0})
+            merged['seconds'] += timer['seconds']
+            merged['calls'] += timer['calls']
+            merged['max_seconds'] = max(merged['max_seconds'], timer['max_seconds'])
+        workers.extend(stats['workers'])
+
+    return {'counters': dict(counters), 'timers': timers, 'workers': workers}
+
+
+def format_stats(stats: ProfileStats) -> str:
+    counters = stats['counters']
+    timers = stats['timers']
+    lines = []
+
+    depths = sorted(int(name.rsplit('_', 1)[1]) for name in counters if name.startswith('nodes_depth_'))
+    per_depth = ''.join(f', depth {depth}: {counters[f"nodes_depth_{depth}"]}' for depth in depths)
+    lines.append(f'nodes expanded: {counters.get("nodes_expanded", 0)}{per_depth}, cutoffs: {counters.get("cutoffs", 0)}')
+
+    lookups = counters.get('table_hits', 0) + counters.get('table_misses', 0)
+    if lookups:
+        lines.append(f'transposition table: {counters["table_hits"] / lookups * 100:.1f}% hit rate over {lookups} lookups, {counters.get("table_evictions", 0)} evictions')
+
+    lines.append(', '.join(f'{name}: {timer["seconds"]:.3f}s' for name, timer in timers.items() if name in ('filter', 'distribution', 'aggregation')))
+
+    if (candidate := timers.get('candidate')) is not None:
+        lines.append(f'candidates: {candidate["calls"]}, mean {candidate["seconds"] / candidate["calls"] * 1000:.2f}ms, max {candidate["max_seconds"] * 1000:.2f}ms')
+        if (dispatch := timers.get('pool_process')) is not None:
+            # worker time not spent scoring while the pool was waiting on it
+            overhead = dispatch['seconds'] * counters.get('pool_workers', 1) - candidate['seconds']
+            lines.append(f'pool dispatch overhead: {max(0.0, overhead):.3f}s over {dispatch["calls"]} process calls')
+
+    lines.append('rss: ' + ', '.join(f'{worker["pid"]}: {worker["rss_bytes"] / (1024 * 1024):.1f}MB' for worker in stats['workers']))
+    return '\n'.join(lines)
+
+
+def report_stats(stats: ProfileStats, output: Optional[str] = None):
+    print(format_stats(stats))
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(stats, f, indent=2)
+        print(f'Wrote profile to {output}')
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from typing import Optional
 
@@ -61,3 +62,17 @@ def get_previous_answers() -> list[str]:
             ret.append(line.strip())
 
     return ret
+
+
+def get_files_digest(paths: list[str]) -> bytes:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents = f.read()
+        digest.update(len(contents).to_bytes(8, 'little'))
+        digest.update(contents)
+    return digest.digest()
+
+
+def get_words_digest(words: list[str]) -> bytes:
+    return hashlib.sha256('\n'.join(words).encode()).digest()
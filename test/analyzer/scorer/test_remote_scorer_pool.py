@@ -0,0 +1,66 @@
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client
+import pytest
+
+from wordle_solver.analyzer.scorer import remote_scorer_pool
+from wordle_solver.analyzer.scorer.remote_scorer_pool import RemoteScorerPool
+from wordle_solver.analyzer.scorer.scorer_child import STOP
+from wordle_solver.analyzer.scorer.scorer_daemon import DEFAULT_AUTHKEY, INIT, get_authkey, run_scorer_daemon
+from wordle_solver.analyzer.scorer.scorer_pool import LocalScorerPool
+from wordle_solver.analyzer.scorer.transposition_table import DEFAULT_BUDGET_BYTES
+from wordle_solver.common.candidate_ranking import DEFAULT_NUM_RANKED, CandidateRanking
+from wordle_solver.common.guess_result import get_guess_result
+from wordle_solver.util.utils import get_previous_answers
+
+
+def _start_daemon() -> tuple[Process, tuple[str, int]]:
+    conn, child_conn = Pipe()
+    process = Process(target=run_scorer_daemon, args=(('127.0.0.1', 0), get_authkey(), child_conn), daemon=True)
+    process.start()
+    return process, conn.recv()
+
+
+def test_matches_local_pool_and_survives_lost_worker(monkeypatch):
+    monkeypatch.setattr(remote_scorer_pool, 'RECONNECT_DELAY_SECONDS', 0.01)
+    words = get_previous_answers()[::20]
+    daemons = [_start_daemon() for _ in range(2)]
+    pool = RemoteScorerPool([address for _, address in daemons], words, 1, 6, 2, False)
+    local_pool = LocalScorerPool(words, 1, 6, 2, False)
+    indexes = list(range(0, len(words), 4))
+
+    try:
+        assert pool.process(indexes, len(indexes)) == local_pool.process(indexes, len(indexes))
+
+        for p in (pool, local_pool):
+            p.update(words[0], get_guess_result(words[0], words[1]))
+        expected = local_pool.process(indexes, len(indexes))
+        assert pool.process(indexes, len(indexes)) == expected
+
+        daemons[0][0].terminate()
+        daemons[0][0].join()
+        assert pool.process(indexes, len(indexes)) == expected
+        assert pool.profile_stats()['counters']['pool_workers'] == 1
+    finally:
+        pool.close()
+        for process, _ in daemons:
+            process.terminate()
+
+
+def test_rebuilds_after_failed_init():
+    words = get_previous_answers()[::20]
+    process, address = _start_daemon()
+    init_args = (words, 1, 6, 2, False, DEFAULT_BUDGET_BYTES, True, CandidateRanking.Heuristic, DEFAULT_NUM_RANKED, False)
+
+    try:
+        for args, ok in ((init_args, True), (init_args[:-1], False), (init_args, True)):
+            with Client(address, authkey=get_authkey()) as conn:
+                conn.send((INIT, args))
+                assert conn.recv()[0] == ok
+                conn.send((STOP, ()))
+    finally:
+        process.terminate()
+
+
+def test_default_authkey_stays_on_loopback():
+    with pytest.raises(ValueError):
+        run_scorer_daemon(('0.0.0.0', 0), DEFAULT_AUTHKEY)
@@ -0,0 +1,51 @@
+from wordle_solver.analyzer.scorer.scorer_child import EV_TOLERANCE, ScorerChild
+from wordle_solver.util.utils import get_previous_answers
+
+
+def test_float_matches_exact():
+    _test_float_matches_exact(0)
+
+
+def test_float_matches_exact_last_guesses():
+    _test_float_matches_exact(4)
+
+
+def _test_float_matches_exact(starting_guesses: int):
+    words = get_previous_answers()[::20]
+    float_child = ScorerChild(words, starting_guesses, 6, 2)
+    exact_child = ScorerChild(words, starting_guesses, 6, 2, exact=True)
+
+    for i in range(0, len(words), 5):
+        assert abs(float_child.process_word(i) - float(exact_child.process_word(i))) < EV_TOLERANCE
+
+
+def test_pruning_keeps_values():
+    words = get_previous_answers()[::40]
+    pruned_child = ScorerChild(words, 0, 6, 3)
+    full_child = ScorerChild(words, 0, 6, 3, pruning=False)
+
+    for i in range(0, len(words), 10):
+        assert pruned_child.process_word(i) == full_child.process_word(i)
+    assert pruned_child.search_stats()['nodes_expanded'] < full_child.search_stats()['nodes_expanded']
+
+
+def test_pruning_caches_exact_values():
+    words = get_previous_answers()[3::20]
+    pruned_child = ScorerChild(words, 0, 6, 3)
+    full_child = ScorerChild(words, 0, 6, 3, pruning=False)
+    indexes = list(range(0, len(words), 3))
+    pruned_child.process_words(indexes)
+    full_child.process_words(indexes, bounded=False)
+
+    full_evs = dict(full_child._table.items())
+    for key, ev in pruned_child._table.items():
+        assert ev == full_evs[key]
+
+
+def test_survivor_keys_merge_positions():
+    words = get_previous_answers()[::40]
+    child = ScorerChild(words, 0, 6, 3, pruning=False, check_keys=True)
+
+    for i in range(0, len(words), 10):
+        child.process_word(i)
+    assert child.profile_stats()['counters']['table_hits'] > 0
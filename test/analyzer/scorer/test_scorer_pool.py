@@ -0,0 +1,70 @@
+from wordle_solver.analyzer.scorer.scorer_pool import LocalScorerPool, ScorerPool
+from wordle_solver.common.guess_result import get_guess_result
+from wordle_solver.util.utils import get_previous_answers
+
+
+def test_matches_local_pool():
+    words = get_previous_answers()[::20]
+    pool = ScorerPool(2, words, 1, 6, 1, False)
+    local_pool = LocalScorerPool(words, 1, 6, 1, False)
+    indexes = list(range(0, len(words), 2))
+
+    try:
+        assert pool.process(indexes, len(indexes)) == local_pool.process(indexes, len(indexes))
+
+        for p in (pool, local_pool):
+            p.update(words[0], get_guess_result(words[0], words[1]))
+        assert pool.process(indexes, len(indexes)) == local_pool.process(indexes, len(indexes))
+
+        for p in (pool, local_pool):
+            p.reset()
+        assert pool.process(indexes, len(indexes)) == local_pool.process(indexes, len(indexes))
+    finally:
+        pool.close()
+
+
+def test_bounded_keeps_minimum():
+    words = get_previous_answers()[::40]
+    pool = ScorerPool(2, words, 0, 6, 3, False)
+    local_pool = LocalScorerPool(words, 0, 6, 3, False)
+    indexes = list(range(0, len(words), 4))
+
+    try:
+        full = local_pool.process(indexes, len(indexes))
+        for p in (pool, local_pool):
+            bounded = p.process(indexes, len(indexes), bounded=True)
+            assert min(bounded) == min(full)
+            assert all(ev == exact or (ev == float('inf') and exact > min(full)) for ev, exact in zip(bounded, full))
+    finally:
+        pool.close()
+
+
+def test_unbounded_scores_every_word():
+    words = get_previous_answers()[::20]
+    pool = ScorerPool(2, words, 0, 6, 2, False)
+    local_pool = LocalScorerPool(words, 0, 6, 2, False)
+    indexes = list(range(0, len(words), 2))
+
+    try:
+        expected = local_pool.process(indexes, len(indexes))
+        assert float('inf') not in expected
+        assert pool.process(indexes, len(indexes)) == expected
+    finally:
+        pool.close()
+
+
+def test_timed_out_search_leaves_workers_usable():
+    words = get_previous_answers()[::20]
+    pool = ScorerPool(2, words, 0, 6, 2, False)
+    local_pool = LocalScorerPool(words, 0, 6, 2, False)
+    indexes = list(range(0, len(words), 2))
+
+    try:
+        expected = local_pool.process(indexes, len(indexes))
+        for p in (pool, local_pool):
+            p.set_search_limits(None, 0.0)
+            assert all(ev == float('inf') for ev in p.process(indexes, len(indexes), bounded=True))
+            p.set_search_limits(None, None)
+            assert p.process(indexes, len(indexes)) == expected
+    finally:
+        pool.close()
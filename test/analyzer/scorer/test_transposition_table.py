@@ -0,0 +1,38 @@
+from wordle_solver.analyzer.scorer.transposition_table import ENTRY_OVERHEAD_BYTES, TranspositionTable
+
+
+def _key(i: int, remaining_depth: int = 1) -> tuple[bytes, int, int]:
+    return (i.to_bytes(8), 5, remaining_depth)
+
+
+def test_counters():
+    table = TranspositionTable()
+    assert table.get(_key(0)) is None
+    table.put(_key(0), 1.5, 10)
+
+    assert table.get(_key(0)) == 1.5
+    assert table.get(_key(0, 2)) is None
+    assert table.stats() | {'bytes': 0} == {'entries': 1, 'bytes': 0, 'hits': 1, 'misses': 2, 'evictions': 0}
+
+
+def test_evicts_cheapest_within_budget():
+    budget = 20 * (ENTRY_OVERHEAD_BYTES + 64)
+    table = TranspositionTable(budget)
+
+    for i in range(100):
+        table.put(_key(i), float(i), i)
+
+    assert table.num_bytes <= budget
+    assert table.evictions > 0
+    assert table.get(_key(99)) == 99.0
+    assert table.get(_key(0)) is None
+
+
+def test_clear():
+    table = TranspositionTable()
+    table.put(_key(0), 1.0, 1)
+    table.clear()
+
+    assert len(table) == 0
+    assert table.num_bytes == 0
+    assert table.get(_key(0)) is None
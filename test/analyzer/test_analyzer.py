@@ -0,0 +1,41 @@
+from wordle_solver.analyzer.analyzer import Analyzer
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import from_pattern_id, get_guess_result, to_pattern_id
+from wordle_solver.util.utils import get_previous_answers
+
+
+def test_batch_matches_sequential():
+    words = get_previous_answers()[::20]
+    analyzer = Analyzer(lambda: None, words, None, 1, 1, False, use_opening_book=False, in_process=True, corpus=Corpus.from_words(words))
+
+    first = analyzer.get_best_guess()
+    histories = [[], *([(first, to_pattern_id(get_guess_result(first, answer)))] for answer in words[::3])]
+
+    expected = []
+    for history in histories:
+        analyzer.reset()
+        for word, pattern_id in history:
+            analyzer.update(from_pattern_id(pattern_id), word)
+        expected.append(analyzer.get_best_guess())
+
+    analyzer.reset()
+    assert analyzer.get_best_guesses(histories) == expected
+    assert analyzer.get_best_guess() == first
+
+
+def test_time_budget_falls_back_to_finished_depth():
+    words = get_previous_answers()[::20]
+    corpus = Corpus.from_words(words)
+
+    def best_guess(max_search_depth, time_budget_s=None):
+        analyzer = Analyzer(lambda: None, words, None, 1, max_search_depth, False, use_opening_book=False, in_process=True, corpus=corpus, time_budget_s=time_budget_s)
+        return analyzer.get_best_guess(), analyzer.last_search()
+
+    assert best_guess(2, 1000.0) == (best_guess(2)[0], (2, True))
+    assert best_guess(2, 0.0) == (best_guess(1)[0], (1, False))
+
+    # a guess played without searching, like one from the guess store, reports no depth
+    analyzer = Analyzer(lambda: None, words, None, 1, 2, False, use_opening_book=False, in_process=True, corpus=corpus, time_budget_s=1000.0)
+    analyzer.get_best_guess()
+    analyzer.update(get_guess_result(words[0], words[1]), words[0])
+    assert analyzer.last_search() == (None, True)
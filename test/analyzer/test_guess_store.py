@@ -0,0 +1,41 @@
+from wordle_solver.analyzer.guess_store import GuessStore, decode_history, encode_history, get_strategy
+from wordle_solver.common.candidate_ranking import CandidateRanking
+from wordle_solver.common.corpus import Corpus
+
+
+TEST_CANDIDATES: list[str] = ["robot", "oreos", "taurs", "tares", "teams", "trrrs", "sweet", "feral", "coyly"]
+STRATEGY = get_strategy(CandidateRanking.Heuristic, 20, False, 'tares')
+
+
+def test_round_trip_across_connections(tmp_path):
+    path = str(tmp_path / 'guesses.sqlite')
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    guesses = {(): 'tares', (('tares', 5),): 'robot', (('tares', 5), ('robot', 0)): 'coyly'}
+
+    store = GuessStore(TEST_CANDIDATES, corpus, 1, STRATEGY, path)
+    store.put_many(guesses)
+    store.close()
+
+    store = GuessStore(TEST_CANDIDATES, corpus, 1, STRATEGY, path)
+    assert store.load() == guesses
+    assert store.get((('tares', 5),)) == 'robot'
+    assert store.get((('tares', 6),)) is None
+    store.close()
+
+    for history in guesses:
+        assert decode_history(encode_history(history)) == history
+
+
+def test_isolated_by_search_setup(tmp_path):
+    path = str(tmp_path / 'guesses.sqlite')
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    GuessStore(TEST_CANDIDATES, corpus, 1, STRATEGY, path).put((), 'tares')
+
+    others = [
+        GuessStore(TEST_CANDIDATES, corpus, 2, STRATEGY, path),
+        GuessStore(TEST_CANDIDATES, corpus, 1, get_strategy(CandidateRanking.Entropy, 20, False, 'tares'), path),
+        GuessStore(TEST_CANDIDATES[::-1], Corpus.from_words(TEST_CANDIDATES[::-1]), 1, STRATEGY, path),
+    ]
+    for store in others:
+        assert store.get(()) is None
+        assert len(store) == 0
@@ -0,0 +1,47 @@
+from wordle_solver.analyzer.opener_ranking import OpenerCheckpoint, get_ranking, rank_openers
+from wordle_solver.analyzer.scorer.scorer_pool import LocalScorerPool
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.util.utils import get_previous_answers
+
+
+class CountingPool(LocalScorerPool):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.scored = []
+
+    def process(self, indexes, num_items, bounded=False):
+        self.scored.extend(indexes)
+        return super().process(indexes, num_items, bounded)
+
+
+def test_resumes_from_cut_checkpoint(tmp_path):
+    words = get_previous_answers()[::40]
+    corpus = Corpus.from_words(words)
+    path = str(tmp_path / 'openers.checkpoint')
+    pool = CountingPool(words, 0, 6, 1, False, False, corpus)
+
+    expected = rank_openers(pool, words, corpus, OpenerCheckpoint(path, 'setup'), progress_bar=False)
+    assert sorted(expected) == sorted(words)
+    assert get_ranking(words, expected)[0][1] == min(LocalScorerPool(words, 0, 6, 1, False, False, corpus).process(range(len(words)), len(words)))
+
+    # a run killed mid write leaves a partial last line behind
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    with open(path, 'w') as f:
+        f.writelines(lines[:11])
+        f.write(lines[11][:4])
+
+    pool.scored = []
+    assert rank_openers(pool, words, corpus, OpenerCheckpoint(path, 'setup'), progress_bar=False) == expected
+    assert len(pool.scored) == len(words) - 10
+
+    # resuming again must not find the cut short line glued onto a record
+    pool.scored = []
+    assert rank_openers(pool, words, corpus, OpenerCheckpoint(path, 'setup'), progress_bar=False) == expected
+    assert len(pool.scored) == 0
+    with open(path, 'r') as f:
+        assert len(f.readlines()) == len(words) + 1
+
+    pool.scored = []
+    assert rank_openers(pool, words, corpus, OpenerCheckpoint(path, 'other setup'), progress_bar=False) == expected
+    assert len(pool.scored) == len(words)
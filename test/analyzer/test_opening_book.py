@@ -0,0 +1,47 @@
+from wordle_solver.analyzer.guess_store import get_strategy
+from wordle_solver.analyzer.opening_book import ROOT, OpeningBook, build_opening_book
+from wordle_solver.common.candidate_ranking import CandidateRanking
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import get_guess_result, to_pattern_id
+
+
+TEST_CANDIDATES: list[str] = ["robot", "oreos", "taurs", "tares", "teams", "trrrs", "sweet", "feral", "coyly"]
+STRATEGY = get_strategy(CandidateRanking.Heuristic, 20, False, 'tares')
+
+
+class _FirstWordAnalyzer:
+    def reset(self):
+        self.history = []
+
+    def update(self, results, word):
+        self.history.append((word, to_pattern_id(results)))
+
+    def get_best_guess(self) -> str:
+        return 'tares' if not self.history else 'robot'
+
+
+def test_round_trip(tmp_path):
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    book = build_opening_book(_FirstWordAnalyzer(), TEST_CANDIDATES, corpus, 'tares', 1, STRATEGY, 2, progress_bar=False)
+    path = str(tmp_path / 'book.npz')
+    book.save(path)
+    loaded = OpeningBook.load(path)
+
+    assert len(loaded) == len(book)
+    assert loaded.matches(TEST_CANDIDATES, corpus, 'tares', 1, STRATEGY)
+    assert not loaded.matches(TEST_CANDIDATES, corpus, None, 1, STRATEGY)
+    assert not loaded.matches(TEST_CANDIDATES, corpus, 'tares', 2, STRATEGY)
+    assert not loaded.matches(TEST_CANDIDATES, corpus, 'tares', 1, get_strategy(CandidateRanking.Entropy, 20, False, 'tares'))
+
+    assert TEST_CANDIDATES[loaded.get_guess(ROOT)] == 'tares'
+    for answer in TEST_CANDIDATES:
+        pattern_id = to_pattern_id(get_guess_result('tares', answer))
+        child = loaded.get_child(ROOT, pattern_id)
+        if answer == 'tares':
+            assert child is None
+            continue
+
+        same_bucket = [word for word in TEST_CANDIDATES if to_pattern_id(get_guess_result('tares', word)) == pattern_id]
+        expected = same_bucket[0] if len(same_bucket) == 1 else 'robot'
+        assert TEST_CANDIDATES[loaded.get_guess(child)] == expected
+        assert loaded.get_child(child, 0) is None
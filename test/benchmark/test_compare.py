@@ -0,0 +1,16 @@
+from wordle_solver.benchmark.compare import compare_results, get_regressions
+from wordle_solver.benchmark.runner import RESULTS_VERSION
+
+
+def _results(**mins: float) -> dict:
+    return {'version': RESULTS_VERSION, 'results': {name: {'min': value} for name, value in mins.items()}}
+
+
+def test_flags_only_regressions_past_threshold():
+    baseline = _results(fast=1.0, slow=1.0, removed=1.0)
+    current = _results(fast=0.5, slow=1.2, added=3.0)
+
+    comparisons = compare_results(baseline, current)
+    assert [name for name, *_ in comparisons] == ['fast', 'slow']
+    assert [name for name, *_ in get_regressions(comparisons, 0.1)] == ['slow']
+    assert get_regressions(comparisons, 0.25) == []
@@ -0,0 +1,28 @@
+import numpy as np
+
+from wordle_solver.common.bitset_index import pack_bits, unpack_bits
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.common.guess_result import get_guess_result, to_res_arr
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.util.utils import read_all_words
+from wordle_solver.util.word_utils import convert_word
+
+
+def test_pack_round_trip():
+    mask = np.random.default_rng(0).random(131) < 0.5
+    assert np.array_equal(unpack_bits(pack_bits(mask), len(mask)), mask)
+
+
+def test_survivors_match_feedback():
+    all_words = read_all_words()
+    index = Corpus.from_words(all_words).get_bitset_index()
+    rng = np.random.default_rng(0)
+
+    for _ in range(50):
+        guess, answer = (all_words[i] for i in rng.choice(len(all_words), 2))
+        res = get_guess_result(guess, answer)
+        ss = SolveStatusNp()
+        ss.update(np.array(convert_word(guess), dtype=np.uint8), to_res_arr(guess, res))
+
+        expected = [get_guess_result(guess, word) == res for word in all_words]
+        assert np.array_equal(index.get_survivor_mask(ss), expected)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from wordle_solver.common.corpus import Corpus, SharedCorpus, attach_corpus
+
+
+TEST_CANDIDATES: list[str] = ["robot", "oreos", "taurs", "tares", "teams", "trrrs", "sweet", "feral", "coyly"]
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'corpus.npz')
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    corpus.save(b'sources', path)
+
+    loaded = Corpus.load(b'sources', path)
+    for field, arr in corpus.arrays().items():
+        assert np.array_equal(getattr(loaded, field), arr)
+        assert getattr(loaded, field).dtype == arr.dtype
+
+
+def test_stale_sources_are_rejected(tmp_path):
+    path = str(tmp_path / 'corpus.npz')
+    Corpus.from_words(TEST_CANDIDATES).save(b'sources', path)
+
+    assert Corpus.load(b'changed', path) is None
+    assert Corpus.load(b'sources', str(tmp_path / 'missing.npz')) is None
+
+
+def test_shared_round_trip():
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    shared = SharedCorpus(corpus)
+    try:
+        attached, blocks = attach_corpus(shared.handle)
+        for field, arr in corpus.arrays().items():
+            assert np.array_equal(getattr(attached, field), arr)
+            assert getattr(attached, field).dtype == arr.dtype
+            assert not getattr(attached, field).flags.writeable
+        # workers regenerate the survivor hashes, they have to match the parent's for keys to agree
+        assert np.array_equal(attached.survivor_hashes, corpus.survivor_hashes)
+
+        # the arrays view the blocks, so they have to go before the blocks close
+        del attached
+        for shm in blocks:
+            shm.close()
+    finally:
+        shared.close()
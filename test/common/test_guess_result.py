@@ -0,0 +1,48 @@
+import numpy as np
+
+from wordle_solver.common.guess_result import from_pattern_id, get_guess_pattern_ids, get_guess_result, get_pattern_ids, patterns_to_res_arrs, to_pattern_id, to_res_arr
+from wordle_solver.util.constants import ALPHABET_LETTERS
+from wordle_solver.util.utils import read_all_words
+from wordle_solver.util.word_utils import convert_word
+
+
+TEST_CANDIDATES: list[str] = ["robot", "oreos", "taurs", "tares", "teams", "trrrs", "sweet", "feral", "coyly", "eerie", "ryijy", "yabby", "sissy", "issus", "llama", "allay"]
+
+
+def test_batch_matches_scalar():
+    _test_batch(TEST_CANDIDATES, TEST_CANDIDATES)
+
+
+def test_batch_matches_scalar_sampled():
+    all_words = read_all_words()
+    rng = np.random.default_rng(0)
+    guesses = [all_words[i] for i in rng.choice(len(all_words), 40, replace=False)]
+    answers = [all_words[i] for i in rng.choice(len(all_words), 400, replace=False)]
+
+    _test_batch(guesses, answers)
+
+
+def test_res_arrs_match_scalar():
+    for guess in TEST_CANDIDATES:
+        guess_arr = np.array(convert_word(guess), dtype=np.uint8)
+        results = [get_guess_result(guess, answer) for answer in TEST_CANDIDATES]
+        res_arrs = patterns_to_res_arrs(guess_arr, np.array([to_pattern_id(res) for res in results]))
+
+        for res, res_arr in zip(results, res_arrs):
+            assert np.array_equal(res_arr, to_res_arr(guess, res))
+
+
+def _test_batch(guesses: list[str], answers: list[str]):
+    guesses_arr = np.array([convert_word(word) for word in guesses], dtype=np.uint8)
+    answers_arr = np.array([convert_word(word) for word in answers], dtype=np.uint8)
+    char_counts = np.array([np.bincount(row, minlength=ALPHABET_LETTERS) for row in answers_arr], dtype=np.uint8)
+    actual = get_pattern_ids(guesses_arr, answers_arr)
+
+    for guess_arr, row in zip(guesses_arr, actual):
+        assert np.array_equal(get_guess_pattern_ids(guess_arr, answers_arr, char_counts), row)
+
+    for i, guess in enumerate(guesses):
+        for j, answer in enumerate(answers):
+            expected = get_guess_result(guess, answer)
+            assert to_pattern_id(expected) == actual[i, j]
+            assert from_pattern_id(actual[i, j]) == expected
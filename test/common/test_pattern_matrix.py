@@ -0,0 +1,56 @@
+import numpy as np
+
+from wordle_solver.common.guess_result import from_pattern_id, get_guess_result
+from wordle_solver.common.pattern_matrix import build_pattern_matrix, load_pattern_matrix
+from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
+from wordle_solver.common.word_reducer import WordReducer
+
+
+TEST_CANDIDATES: list[str] = ["robot", "oreos", "taurs", "tares", "teams", "trrrs", "sweet", "feral", "coyly", "eerie", "ryijy", "yabby"]
+
+
+def test_matches_guess_result(tmp_path):
+    path = str(tmp_path / 'patterns.bin')
+    build_pattern_matrix(TEST_CANDIDATES, path, progress_bar=False)
+    mat = load_pattern_matrix(TEST_CANDIDATES, path)
+
+    for i, guess in enumerate(TEST_CANDIDATES):
+        for j, answer in enumerate(TEST_CANDIDATES):
+            assert from_pattern_id(mat[i, j]) == get_guess_result(guess, answer)
+
+
+def test_rejects_other_words(tmp_path):
+    path = str(tmp_path / 'patterns.bin')
+    build_pattern_matrix(TEST_CANDIDATES, path, progress_bar=False)
+
+    assert load_pattern_matrix(TEST_CANDIDATES[::-1], path) is None
+    assert load_pattern_matrix(TEST_CANDIDATES, str(tmp_path / 'missing.bin')) is None
+
+
+def test_same_distribution(tmp_path):
+    path = str(tmp_path / 'patterns.bin')
+    build_pattern_matrix(TEST_CANDIDATES, path, progress_bar=False)
+    mat = load_pattern_matrix(TEST_CANDIDATES, path)
+
+    computed = WordReducer(TEST_CANDIDATES, SolveStatusNp())
+    from_matrix = WordReducer(TEST_CANDIDATES, SolveStatusNp(), mat)
+
+    for i in range(len(TEST_CANDIDATES)):
+        _, expected_patterns, expected_cnts = computed.get_guess_distr_and_counts(i)
+        _, actual_patterns, actual_cnts = from_matrix.get_guess_distr_and_counts(i)
+
+        expected = {int(pattern): cnt for pattern, cnt in zip(expected_patterns, expected_cnts)}
+        actual = {int(pattern): cnt for pattern, cnt in zip(actual_patterns, actual_cnts)}
+        assert expected.keys() == actual.keys()
+        assert np.allclose([expected[k] for k in expected], [actual[k] for k in expected])
+
+
+def test_warns_once_per_file(tmp_path, capsys):
+    path = str(tmp_path / 'patterns.bin')
+    build_pattern_matrix(TEST_CANDIDATES, path, progress_bar=False)
+
+    assert load_pattern_matrix(TEST_CANDIDATES[::-1], path, warn=False) is None
+    assert capsys.readouterr().out == ''
+    for _ in range(3):
+        assert load_pattern_matrix(TEST_CANDIDATES[::-1], path) is None
+    assert capsys.readouterr().out.count('was built for a different word list') == 1
@@ -1,10 +1,15 @@
 from collections import Counter
 import numpy as np
 
+from wordle_solver.common.candidate_ranking import CandidateRanking
+from wordle_solver.common.corpus import Corpus
 from wordle_solver.common.guess_result import GuessResult, to_res_arr, get_guess_result
+from wordle_solver.common.pattern_matrix import build_pattern_matrix, load_pattern_matrix
 from wordle_solver.common.single_result import SingleResult
 from wordle_solver.common.solve_status.solve_status_np import SolveStatusNp
 from wordle_solver.common.word_reducer import WordReducer
+from wordle_solver.util.constants import ALPHABET_LETTERS
+from wordle_solver.util.utils import read_all_words
 from wordle_solver.util.word_utils import convert_word
 
 
@@ -57,7 +62,57 @@ def _test_validity(candidates: list[str], guesses: list[str], answers: list[str]
         solve_status.update(np.array(convert_word(guess)), to_res_arr(guess, res))
         word_reducer.update()
 
-        actual_candidates = word_reducer._words_stack[-1]
+        actual_candidates = word_reducer._view('words')
 
         assert sorted(actual_candidates.tolist()) == sorted(expected_as)
         candidates = actual_candidates
+
+
+def test_ranked_candidates_without_matrix(tmp_path):
+    words = [word for i, word in enumerate(read_all_words()) if i % 10 == 0 or word in ('tares', 'robot')]
+    corpus = Corpus.from_words(words)
+    path = str(tmp_path / 'patterns.bin')
+    build_pattern_matrix(words, path, progress_bar=False)
+    pattern_matrix = load_pattern_matrix(words, path)
+    assert pattern_matrix is not None
+
+    ss = SolveStatusNp()
+    with_matrix = WordReducer(words, ss, pattern_matrix, corpus)
+    without_matrix = WordReducer(words, ss, None, corpus)
+    ss.update(with_matrix.get_guess_arr('tares'), to_res_arr('tares', get_guess_result('tares', 'robot')))
+    with_matrix.update()
+    without_matrix.update()
+
+    for ranking in (CandidateRanking.Entropy, CandidateRanking.Mass):
+        assert with_matrix.get_ranked_candidates(ranking, 20) == without_matrix.get_ranked_candidates(ranking, 20)
+
+
+def test_survivor_key_ignores_path():
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    keys = []
+    for guess in ["tsooo", "txxxx"]:
+        ss = SolveStatusNp()
+        reducer = WordReducer(TEST_CANDIDATES, ss, corpus=corpus)
+        ss.update(np.array(convert_word(guess)), to_res_arr(guess, get_guess_result(guess, "teams")))
+        reducer.update()
+        keys.append((reducer.get_survivors().tolist(), reducer.get_survivor_key()))
+
+    assert keys[0][0] == keys[1][0] == [2, 3, 4, 5]
+    assert keys[0][1] == keys[1][1]
+
+    reducer.push(reducer.get_survivors()[:2])
+    assert reducer.get_survivor_key() != keys[0][1]
+
+
+def test_char_scores_match_one_hot():
+    corpus = Corpus.from_words(TEST_CANDIDATES)
+    reducer = WordReducer(TEST_CANDIDATES, SolveStatusNp(), corpus=corpus)
+
+    one_hot = np.eye(ALPHABET_LETTERS)[corpus.words_arr]
+    raw = np.einsum('wpl,w->pl', one_hot, corpus.scores)
+    probs = raw / np.sum(raw, axis=1, keepdims=True)
+    counts = np.sum(one_hot, axis=0)
+    expected = probs * counts + (len(TEST_CANDIDATES) - counts) * (1 - probs)
+
+    assert np.allclose(reducer._get_char_scores(), expected)
+    assert np.allclose(reducer._get_scored_mat(corpus.words_arr, expected), np.sum(one_hot * expected, axis=(1, 2)))
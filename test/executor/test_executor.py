@@ -0,0 +1,20 @@
+from wordle_solver.executor import executor
+from wordle_solver.executor.executor import Executor
+from wordle_solver.executor.parallelism import Parallelism
+from wordle_solver.util.utils import get_previous_answers
+
+
+def test_parallelism_modes_agree(monkeypatch):
+    answers = get_previous_answers()[::80]
+    monkeypatch.setattr(executor, 'get_previous_answers', lambda: answers)
+
+    results = [Executor(None, 2, parallelism=parallelism).execute() for parallelism in (Parallelism.Answer, Parallelism.Candidate, Parallelism.Layer)]
+    assert [answer for answer, _ in results[0]] == answers
+    assert all(guesses is not None for _, guesses in results[0])
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_auto_parallelism_follows_depth():
+    assert Executor(None, 4, max_search_depth=1)._use_answer_parallelism()
+    assert not Executor(None, 4, max_search_depth=2)._use_answer_parallelism()
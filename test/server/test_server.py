@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from wordle_solver.analyzer.analyzer import Analyzer
+from wordle_solver.common.corpus import Corpus
+from wordle_solver.server.load_generator import run_load
+from wordle_solver.server.scheduler import AsyncScorerPool
+from wordle_solver.server.server import SolverServer
+from wordle_solver.util.utils import get_previous_answers
+
+
+def test_server_plays_like_analyzer(tmp_path):
+    words = get_previous_answers()[::20]
+    corpus = Corpus.from_words(words)
+    path = str(tmp_path / 'solver.sock')
+
+    analyzer = Analyzer(lambda: None, words, None, 1, 1, False, use_opening_book=False, in_process=True, corpus=corpus)
+    expected_first = analyzer.get_best_guess()
+    analyzer.close()
+
+    async def play():
+        pool = AsyncScorerPool(1, words, 0, 6, 1, corpus)
+        server = await asyncio.start_unix_server(SolverServer(pool, words, corpus, None, None, 1).handle_client, path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"id": 1, "op": "new"}\n{"id": 2, "op": "guess", "session": "0"}\n')
+            replies = [await reader.readline() for _ in range(2)]
+            writer.close()
+
+            report = await run_load(lambda: asyncio.open_unix_connection(path), words[:6], 2)
+            return replies, report
+        finally:
+            server.close()
+            await server.wait_closed()
+            pool.close()
+
+    replies, report = asyncio.run(play())
+    assert expected_first in replies[1].decode()
+    assert len(report.guesses_taken) == 6
+    assert all(guesses is not None for guesses in report.guesses_taken)
+
+
+def test_dead_worker_gets_error_replies(tmp_path):
+    words = get_previous_answers()[::20]
+    corpus = Corpus.from_words(words)
+    path = str(tmp_path / 'solver.sock')
+
+    async def play():
+        pool = AsyncScorerPool(1, words, 0, 6, 1, corpus)
+        server = await asyncio.start_unix_server(SolverServer(pool, words, corpus, None, None, 1).handle_client, path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            pool._processes[0].kill()
+            pool._processes[0].join()
+            # the dead worker is seen once its pipe closes, the guess gets an error instead of waiting forever
+            writer.write(b'{"id": 1, "op": "new"}\n{"id": 2, "op": "guess", "session": "0"}\n{"id": 3, "op": "guess", "session": "0"}\n')
+            replies = [json.loads(await asyncio.wait_for(reader.readline(), 10)) for _ in range(3)]
+            writer.close()
+            return replies
+        finally:
+            server.close()
+            await server.wait_closed()
+            pool.close()
+
+    replies = asyncio.run(play())
+    assert replies[0] == {'id': 1, 'session': '0'}
+    assert all('error' in reply for reply in replies[1:])
@@ -0,0 +1,28 @@
+from wordle_solver.util.profiler import Profiler, format_stats, merge_stats
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    profiler.count('nodes_expanded')
+    with profiler.time('filter'):
+        pass
+
+    stats = profiler.stats()
+    assert stats['counters'] == {}
+    assert stats['timers'] == {}
+
+
+def test_merge_sums_workers():
+    first = Profiler(True)
+    second = Profiler(True)
+    first.count('nodes_depth_1', 2)
+    second.count('nodes_depth_1', 3)
+    first.record('candidate', 0.5)
+    second.record('candidate', 0.25)
+    second.record('candidate', 1.0)
+
+    merged = merge_stats([first.stats({'nodes_expanded': 2}), second.stats({'nodes_expanded': 3})])
+    assert merged['counters'] == {'nodes_depth_1': 5, 'nodes_expanded': 5}
+    assert merged['timers']['candidate'] == {'seconds': 1.75, 'calls': 3, 'max_seconds': 1.0}
+    assert len(merged['workers']) == 2
+    assert 'depth 1: 5' in format_stats(merged)